@@ -0,0 +1,178 @@
+import logging
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, ThreadPoolExecutor,
+                                TimeoutError, wait)
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from clocks import SYSTEM_CLOCK
+from metrics import Histogram
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+POOL_CONNECTIONS = 1
+POOL_MAXSIZE = 10
+TIMINGS_SIZE = 100
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+
+logger = logging.getLogger(__name__)
+
+_current_client = None
+
+
+class PracticumClient:
+    """HTTP-клиент API Практикума поверх keep-alive сессии."""
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT,
+                 pool_connections=POOL_CONNECTIONS,
+                 pool_maxsize=POOL_MAXSIZE, hedging=False,
+                 clock=SYSTEM_CLOCK):
+        """Открывает сессию с таймаутами и размером пула.
+
+        С hedging=True запрос, не ответивший за наблюдаемый p95,
+        дублируется, и берётся первый полученный ответ. По часам clock
+        замеряется длительность запросов.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.hedging = hedging
+        self.clock = clock
+        self.timings = deque(maxlen=TIMINGS_SIZE)
+        self.latency = Histogram()
+        self.requests_count = 0
+        self.reconnects = 0
+        self.hedges = 0
+        self.session = self._new_session()
+        self._executor = None
+        if hedging:
+            self._executor = ThreadPoolExecutor(
+                max_workers=pool_maxsize, thread_name_prefix="api-hedge"
+            )
+
+    def _new_session(self):
+        """Создаёт сессию с настроенным пулом соединений."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def reconnect(self):
+        """Закрывает старые соединения и открывает новую сессию."""
+        self.session.close()
+        self.session = self._new_session()
+        self.reconnects += 1
+        logger.warning("Сессия API пересоздана")
+
+    def get(self, url, **kwargs):
+        """GET-запрос с таймаутами и, если включено, хеджированием."""
+        kwargs.setdefault("timeout", self.timeout)
+        delay = self.hedge_delay()
+        if delay is None:
+            response = self._attempt(url, kwargs)
+        else:
+            response = self._hedged(url, kwargs, delay)
+        self.requests_count += 1
+        return response
+
+    def hedge_delay(self):
+        """Через сколько секунд дублировать запрос, None — не дублировать."""
+        if not self.hedging or self.latency.count < HEDGE_MIN_SAMPLES:
+            return None
+        delay = self.latency.percentile(HEDGE_PERCENTILE)
+        if delay == float("inf"):
+            return None
+        return delay
+
+    def _hedged(self, url, kwargs, delay):
+        primary = self._executor.submit(self._attempt, url, kwargs)
+        try:
+            return primary.result(timeout=delay)
+        except TimeoutError:
+            pass
+        self.hedges += 1
+        logger.debug("Нет ответа API за %s s, отправлен дубль", delay)
+        pending = {primary, self._executor.submit(self._attempt, url, kwargs)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    return future.result()
+        raise error
+
+    def _attempt(self, url, kwargs):
+        """Один запрос с повтором на протухшем соединении."""
+        start = self.clock.monotonic()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.ConnectionError as error:
+            if isinstance(error, requests.Timeout):
+                raise
+            logger.warning(f"Соединение с API разорвано: {error}")
+            self.reconnect()
+            start = self.clock.monotonic()
+            response = self.session.get(url, **kwargs)
+        elapsed = self.clock.monotonic() - start
+        self.timings.append(elapsed)
+        self.latency.observe(elapsed)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Запрос к API занял %.1f ms", elapsed * 1000)
+        return response
+
+    def stats(self):
+        """Сводка по времени последних запросов."""
+        timings = sorted(self.timings)
+        if not timings:
+            return {"requests": self.requests_count,
+                    "reconnects": self.reconnects,
+                    "hedges": self.hedges}
+        return {
+            "requests": self.requests_count,
+            "reconnects": self.reconnects,
+            "hedges": self.hedges,
+            "p95": self.latency.percentile(HEDGE_PERCENTILE),
+            "last": self.timings[-1],
+            "avg": sum(timings) / len(timings),
+            "max": timings[-1],
+        }
+
+    def close(self):
+        """Закрывает все соединения пула."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self):
+        """Возвращает клиента для with-блока."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Закрывает клиента при выходе из with-блока."""
+        self.close()
+
+
+def _close_response(future):
+    """Освобождает соединение проигравшего дубля."""
+    if future.exception() is None:
+        future.result().close()
+
+
+def use_client(client):
+    """Делает клиента текущим для get_api_answer."""
+    global _current_client
+    _current_client = client
+
+
+def current_client():
+    """Возвращает текущего клиента или None."""
+    return _current_client
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import sys
+import time
+
+import aiohttp
+from requests import HTTPError
+
+import homework
+import tenants
+from exceptions import TokenError
+from scheduler import startup_delay
+
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+MAX_CONNECTIONS = 100
+
+logger = logging.getLogger(__name__)
+
+
+def create_session(limit=MAX_CONNECTIONS):
+    """Общая сессия aiohttp с таймаутами и лимитом соединений."""
+    timeout = aiohttp.ClientTimeout(
+        connect=homework.API_CONNECT_TIMEOUT,
+        sock_read=homework.API_READ_TIMEOUT,
+    )
+    connector = aiohttp.TCPConnector(limit=limit)
+    return aiohttp.ClientSession(timeout=timeout, connector=connector)
+
+
+async def get_api_answer(session, current_timestamp, headers):
+    """Асинхронный запрос к эндпоинту API."""
+    timestamp = current_timestamp or int(time.time())
+    params = {"from_date": timestamp}
+
+    async with session.get(
+        homework.ENDPOINT, headers=headers, params=params
+    ) as homework_statuses:
+        logger.info("Произошел запрос к API")
+        if homework_statuses.status != 200:
+            raise HTTPError(
+                f"{homework_statuses.status} {homework_statuses.reason} "
+                f"for url: {homework_statuses.url}"
+            )
+        try:
+            return await homework_statuses.json(content_type=None)
+        except ValueError:
+            logger.error("Ответ API не json")
+
+
+async def send_message(session, chat_id, message):
+    """Асинхронная отправка сообщения через Bot API."""
+    url = TELEGRAM_API_URL.format(token=homework.TELEGRAM_TOKEN)
+    async with session.post(
+        url, json={"chat_id": chat_id, "text": message}
+    ) as response:
+        result = await response.json(content_type=None)
+    if not result.get("ok"):
+        raise HTTPError(f"Telegram API error: {result.get('description')}")
+    logger.info("Telegram message sent")
+
+
+async def poll_once(session, tenant):
+    """Один цикл опроса с той же проверкой, что и в main()."""
+    try:
+        response = await get_api_answer(
+            session, tenant.current_timestamp, tenant.headers
+        )
+        homeworks = homework.check_response(response)
+        if homeworks:
+            result = homework.parse_status(homeworks[0])
+            await send_message(session, tenant.chat_id, result)
+        tenant.current_timestamp = response.get("current_date")
+    except Exception as error:
+        message = homework.error_message(error)
+        logger.error(f"{tenant!r}: {message}")
+        try:
+            await send_message(session, tenant.chat_id, message)
+        except Exception as send_error:
+            logger.error(f"{tenant!r}: сообщение не отправлено {send_error}")
+
+
+async def poll_forever(session, tenant, retry_time=None):
+    """Бесконечный опрос одного пользователя."""
+    retry_time = retry_time or homework.RETRY_TIME
+    await asyncio.sleep(startup_delay(retry_time))
+    while True:
+        await poll_once(session, tenant)
+        await asyncio.sleep(retry_time)
+
+
+async def main_async(registry):
+    """Запускает опрос всех пользователей в одном цикле событий."""
+    async with create_session() as session:
+        await asyncio.gather(
+            *(poll_forever(session, tenant) for tenant in registry)
+        )
+
+
+def main():
+    """Асинхронная версия основной логики бота."""
+    homework.load_config()
+    homework.setup_logging()
+    if len(sys.argv) > 1:
+        registry = tenants.load_tenants(sys.argv[1])
+    elif homework.check_tokens():
+        registry = [
+            tenants.Tenant(
+                "default", homework.PRACTICUM_TOKEN, homework.TELEGRAM_CHAT_ID
+            )
+        ]
+    else:
+        logger.error(TokenError)
+        raise TokenError()
+    if not homework.TELEGRAM_TOKEN:
+        logger.error(TokenError)
+        raise TokenError()
+    asyncio.run(main_async(registry))
+
+
+if __name__ == "__main__":
+    main()
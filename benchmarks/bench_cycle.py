@@ -0,0 +1,186 @@
+"""Бенчмарк цикла опрос → проверка → уведомление на локальных заглушках.
+
+Запуск: python -m benchmarks.bench_cycle --cycles 500 --homeworks 50
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+import tracemalloc
+
+from telegram import Bot
+
+import api_client
+import homework
+from benchmarks.stubs import PracticumStub, TelegramStub
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results.jsonl")
+TRACED_CYCLES = 20
+REPORT_KEYS = ("throughput", "p50_ms", "p99_ms", "peak_kib_per_cycle",
+               "blocks_per_cycle")
+
+
+def run_cycle(bot):
+    """Один цикл main() без паузы; True, если цикл прошёл без ошибок."""
+    try:
+        response = homework.get_api_answer(homework.BEGINNING_TIME)
+        homeworks = homework.check_response(response)
+        messages = [homework.parse_status(item) for item in homeworks]
+        if messages:
+            homework.send_message(bot, messages[0])
+    except Exception:
+        return False
+    return True
+
+
+def percentile(values, q):
+    """Квантиль по отсортированному списку."""
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def measure(bot, cycles):
+    """Длительность каждого цикла и число ошибок."""
+    durations = []
+    errors = 0
+    for _ in range(cycles):
+        start = time.perf_counter()
+        if not run_cycle(bot):
+            errors += 1
+        durations.append(time.perf_counter() - start)
+    return sorted(durations), errors
+
+
+def measure_allocations(bot, cycles=TRACED_CYCLES):
+    """Средний пик выделенной памяти и число блоков на цикл."""
+    tracemalloc.start()
+    peaks = []
+    blocks = 0
+    try:
+        for _ in range(cycles):
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            run_cycle(bot)
+            after = tracemalloc.take_snapshot()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            blocks += sum(
+                stat.count_diff
+                for stat in after.compare_to(before, "filename")
+                if stat.count_diff > 0
+            )
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks), blocks / cycles
+
+
+def git_revision():
+    """Короткий хеш текущего коммита или None."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(cycles=200, latency=0.0, error_rate=0.0, homeworks=1,
+                  pooled=True):
+    """Прогоняет cycles циклов и возвращает словарь с результатами."""
+    practicum = PracticumStub(
+        homeworks=homeworks, latency=latency, error_rate=error_rate
+    ).start()
+    telegram = TelegramStub(latency=latency).start()
+    endpoint, chat_id = homework.ENDPOINT, homework.TELEGRAM_CHAT_ID
+    homework.ENDPOINT, homework.TELEGRAM_CHAT_ID = practicum.endpoint, 1
+    client = api_client.PracticumClient() if pooled else None
+    api_client.use_client(client)
+    bot = Bot(token="123:bench", base_url=telegram.base_url)
+    try:
+        started = time.perf_counter()
+        durations, errors = measure(bot, cycles)
+        total = time.perf_counter() - started
+        peak, blocks = measure_allocations(bot)
+    finally:
+        homework.ENDPOINT, homework.TELEGRAM_CHAT_ID = endpoint, chat_id
+        api_client.use_client(None)
+        if client is not None:
+            client.close()
+        practicum.stop()
+        telegram.stop()
+    return {
+        "revision": git_revision(),
+        "timestamp": int(time.time()),
+        "params": {
+            "cycles": cycles, "latency": latency, "error_rate": error_rate,
+            "homeworks": homeworks, "pooled": pooled,
+        },
+        "throughput": cycles / total,
+        "p50_ms": percentile(durations, 0.5) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "errors": errors,
+        "peak_kib_per_cycle": peak / 1024,
+        "blocks_per_cycle": blocks,
+    }
+
+
+def previous_result(path, params):
+    """Последний сохранённый результат с теми же параметрами."""
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if record["params"] == params:
+                previous = record
+    return previous
+
+
+def save_result(path, result):
+    """Дописывает результат в JSONL-файл."""
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(result) + "\n")
+
+
+def report(result, previous, keys=REPORT_KEYS):
+    """Печатает результат и разницу с предыдущим запуском."""
+    for key in keys:
+        line = f"{key:>20}: {result[key]:10.2f}"
+        if previous:
+            change = (result[key] / previous[key] - 1) * 100
+            line += f"  ({change:+.1f}% vs {previous['revision']})"
+        print(line)
+    print(f"{'errors':>20}: {result['errors']:10d}")
+
+
+def main():
+    """Разбор аргументов командной строки и запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="задержка заглушек в секундах")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--homeworks", type=int, default=1,
+                        help="число работ в ответе API")
+    parser.add_argument("--no-pool", action="store_true",
+                        help="requests.get без keep-alive сессии")
+    parser.add_argument("--results", default=RESULTS_FILE)
+    parser.add_argument("--verbose", action="store_true",
+                        help="не отключать логирование бота")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    result = run_benchmark(
+        cycles=args.cycles, latency=args.latency,
+        error_rate=args.error_rate, homeworks=args.homeworks,
+        pooled=not args.no_pool,
+    )
+    report(result, previous_result(args.results, result["params"]))
+    save_result(args.results, result)
+
+
+if __name__ == "__main__":
+    main()
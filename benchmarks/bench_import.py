@@ -0,0 +1,95 @@
+"""Время импорта модуля бота по данным python -X importtime.
+
+Запуск: python -m benchmarks.bench_import --runs 10 --module homework
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_cycle import (RESULTS_FILE, git_revision,
+                                    previous_result, save_result)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOP_IMPORTS = 5
+
+
+def parse_importtime(stderr, module):
+    """Время импорта module и его зависимостей, в секундах.
+
+    Зависимости — строки с отступом сразу над строкой самого модуля;
+    всё, что импортирует интерпретатор при старте (site и т. п.),
+    в результат не попадает.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        entries.append((name, int(cumulative) / 1_000_000))
+    index = [name.strip() for name, _ in entries].index(module)
+    timings = {module: entries[index][1]}
+    for name, seconds in reversed(entries[:index]):
+        if not name.startswith("  "):
+            break
+        timings[name.strip()] = seconds
+    return timings
+
+
+def import_once(module):
+    """Импорт в отдельном процессе: суммарное время и разбивка по модулям."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(process.stderr, module)
+
+
+def run_benchmark(module="homework", runs=10):
+    """Медиана и минимум времени импорта за runs запусков."""
+    totals = []
+    heaviest = {}
+    for _ in range(runs):
+        timings = import_once(module)
+        totals.append(timings[module])
+        for name, seconds in timings.items():
+            heaviest[name] = min(seconds, heaviest.get(name, seconds))
+    top = sorted(
+        (name for name in heaviest if name != module),
+        key=heaviest.get, reverse=True,
+    )[:TOP_IMPORTS]
+    return {
+        "revision": git_revision(),
+        "timestamp": int(time.time()),
+        "params": {"benchmark": "import", "module": module, "runs": runs},
+        "import_median_ms": statistics.median(totals) * 1000,
+        "import_min_ms": min(totals) * 1000,
+        "heaviest_ms": {name: heaviest[name] * 1000 for name in top},
+    }
+
+
+def main():
+    """Разбор аргументов командной строки и запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="homework")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--results", default=RESULTS_FILE)
+    args = parser.parse_args()
+
+    result = run_benchmark(module=args.module, runs=args.runs)
+    previous = previous_result(args.results, result["params"])
+    for key in ("import_median_ms", "import_min_ms"):
+        line = f"{key:>20}: {result[key]:10.2f}"
+        if previous:
+            change = (result[key] / previous[key] - 1) * 100
+            line += f"  ({change:+.1f}% vs {previous['revision']})"
+        print(line)
+    for name, milliseconds in result["heaviest_ms"].items():
+        print(f"{name:>20}: {milliseconds:10.2f}")
+    save_result(args.results, result)
+
+
+if __name__ == "__main__":
+    main()
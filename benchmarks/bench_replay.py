@@ -0,0 +1,141 @@
+"""Повтор записанной сессии API Практикума через цикл опроса бота.
+
+Запись: RECORD_FILE=session.jsonl python homework.py
+Повтор: python -m benchmarks.bench_replay session.jsonl --speed 0
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import requests
+
+import homework
+from benchmarks.bench_cycle import (RESULTS_FILE, git_revision, percentile,
+                                    previous_result, report, save_result)
+from checkpoint import CheckpointStore
+from clocks import VirtualClock
+from recording import load_events
+
+REPORT_KEYS = ("throughput", "p50_ms", "p99_ms")
+
+
+class ReplayBot:
+    """Бот без сети: запоминает тексты сообщений."""
+
+    def __init__(self):
+        """Список отправленных текстов пуст."""
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        """Сохраняет текст вместо отправки."""
+        self.sent.append(text)
+
+
+class RecordedApi:
+    """Запрос к API, отдающий текущее записанное событие."""
+
+    def __init__(self):
+        """Событие выставляет драйвер перед каждым циклом."""
+        self.event = None
+
+    def __call__(self, current_timestamp):
+        """Записанный ответ или записанная ошибка."""
+        if "error" in self.event:
+            name = self.event["error"]
+            error_type = getattr(requests.exceptions, name, None)
+            if not (isinstance(error_type, type)
+                    and issubclass(error_type, Exception)):
+                error_type = RuntimeError
+            raise error_type(self.event["message"])
+        return self.event["response"]
+
+
+class ReplayPoller(homework.Poller):
+    """Poller, считающий неудачные циклы."""
+
+    errors = 0
+
+    def on_error(self, error):
+        """Учитывает ошибку и обрабатывает её как обычно."""
+        self.errors += 1
+        super().on_error(error)
+
+
+def replay(events, speed=0.0):
+    """Прогоняет ответы API из events через Poller.poll.
+
+    speed=0 — без пауз, иначе во столько раз быстрее записи.
+    Выключатель цепи и дайджест ошибок живут по времени записи.
+    """
+    api_events = [event for event in events if event["type"] == "api"]
+    recorded = [event for event in events if event["type"] == "telegram"]
+    api = RecordedApi()
+    bot = ReplayBot()
+    clock = VirtualClock()
+    durations = []
+    with tempfile.TemporaryDirectory() as directory:
+        poller = ReplayPoller(
+            bot, CheckpointStore(os.path.join(directory, "state.json")),
+            clock=clock, fetch=api,
+        )
+        started = time.perf_counter()
+        for event in api_events:
+            if speed:
+                delay = started + event["t"] / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            clock.advance(event["t"] - clock.monotonic())
+            api.event = event
+            start = time.perf_counter()
+            poller.poll()
+            durations.append(time.perf_counter() - start)
+        total = time.perf_counter() - started
+    durations.sort()
+    return {
+        "polls": len(durations),
+        "throughput": len(durations) / total if total else 0.0,
+        "p50_ms": percentile(durations, 0.5) * 1000 if durations else 0.0,
+        "p99_ms": percentile(durations, 0.99) * 1000 if durations else 0.0,
+        "errors": poller.errors,
+        "short_circuits": poller.breaker.short_circuits,
+        "messages": len(bot.sent),
+        "recorded_messages": len(recorded),
+    }
+
+
+def run_benchmark(path, speed=0.0):
+    """Повтор сессии из файла с метаданными для results.jsonl."""
+    result = replay(load_events(path), speed)
+    result.update({
+        "revision": git_revision(),
+        "timestamp": int(time.time()),
+        "params": {"session": os.path.basename(path), "speed": speed},
+    })
+    return result
+
+
+def main():
+    """Разбор аргументов командной строки и запуск повтора."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("session", help="JSONL-файл записи")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="ускорение относительно записи, 0 — без пауз")
+    parser.add_argument("--results", default=RESULTS_FILE)
+    parser.add_argument("--verbose", action="store_true",
+                        help="не отключать логирование бота")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    result = run_benchmark(args.session, args.speed)
+    report(result, previous_result(args.results, result["params"]),
+           keys=REPORT_KEYS)
+    for key in ("polls", "short_circuits", "messages", "recorded_messages"):
+        print(f"{key:>20}: {result[key]:10d}")
+    save_result(args.results, result)
+
+
+if __name__ == "__main__":
+    main()
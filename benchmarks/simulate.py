@@ -0,0 +1,211 @@
+"""Опрос на виртуальных часах: дни работы бота за секунды.
+
+Запуск: python -m benchmarks.simulate --days 7 --homeworks 20 --outages 5
+"""
+import argparse
+import logging
+import random
+import time
+import tracemalloc
+
+import requests
+
+import homework
+from benchmarks.bench_cycle import percentile
+from clocks import VirtualClock
+from shutdown import Shutdown
+
+START_TIME = 1_650_000_000
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+
+
+class MemoryCheckpoint:
+    """Checkpoint в памяти: симуляция не пишет на диск."""
+
+    def __init__(self):
+        """Состояние пустое, как при первом запуске."""
+        self.state = {}
+
+    def get(self, key, default=None):
+        """Сохранённое значение."""
+        return self.state.get(key, default)
+
+    def update(self, **values):
+        """Запоминает значения."""
+        self.state.update(values)
+
+
+class FakePracticum:
+    """API Практикума в памяти: статусы меняются по расписанию.
+
+    timeline — события (секунды от старта, id работы, статус),
+    outages — окна (начало, конец), когда API недоступно.
+    """
+
+    def __init__(self, clock, timeline, outages=(), latency=0.2):
+        """Каждый запрос сдвигает часы на latency секунд."""
+        self.clock = clock
+        self.timeline = sorted(timeline)
+        self.outages = outages
+        self.latency = latency
+        self.applied = 0
+        self.homeworks = {}
+        self.requests = 0
+
+    def __call__(self, current_timestamp):
+        """Работы, обновлённые не раньше current_timestamp."""
+        self.requests += 1
+        self.clock.advance(self.latency)
+        now = self.clock.monotonic()
+        if any(start <= now < end for start, end in self.outages):
+            raise requests.ConnectionError("API недоступно (симуляция)")
+        while (self.applied < len(self.timeline)
+               and self.timeline[self.applied][0] <= now):
+            offset, homework_id, status = self.timeline[self.applied]
+            self.homeworks[homework_id] = {
+                "id": homework_id,
+                "homework_name": f"hw{homework_id}",
+                "status": status,
+                "date_updated": START_TIME + offset,
+            }
+            self.applied += 1
+        updated = [
+            item for item in self.homeworks.values()
+            if item["date_updated"] >= current_timestamp
+        ]
+        updated.sort(key=lambda item: item["date_updated"], reverse=True)
+        return {"homeworks": updated, "current_date": int(self.clock.time())}
+
+
+class FakeTelegram:
+    """Бот без сети: запоминает время и текст каждого сообщения."""
+
+    def __init__(self, clock, latency=0.05):
+        """Каждая отправка сдвигает часы на latency секунд."""
+        self.clock = clock
+        self.latency = latency
+        self.messages = []
+
+    def send_message(self, chat_id, text):
+        """Сохраняет сообщение вместо отправки."""
+        self.clock.advance(self.latency)
+        self.messages.append((self.clock.monotonic(), text))
+
+
+def make_timeline(homeworks, days, rng):
+    """Сдача, ревью и вердикты для homeworks работ за days дней.
+
+    Смены статуса после конца симуляции отбрасываются: бот их не
+    увидит, и они не должны считаться пропущенными.
+    """
+    timeline = []
+    for homework_id in range(homeworks):
+        moment = rng.uniform(0, days * DAY * 0.8)
+        timeline.append((moment, homework_id, "reviewing"))
+        moment += rng.uniform(HOUR, DAY)
+        if rng.random() < 0.5:
+            timeline.append((moment, homework_id, "rejected"))
+            moment += rng.uniform(HOUR, DAY)
+            timeline.append((moment, homework_id, "reviewing"))
+            moment += rng.uniform(HOUR, DAY)
+        timeline.append((moment, homework_id, "approved"))
+    return [event for event in timeline if event[0] < days * DAY]
+
+
+def make_outages(count, days, rng):
+    """Окна недоступности API по 10–90 минут, count штук."""
+    outages = []
+    for _ in range(count):
+        start = rng.uniform(0, days * DAY)
+        outages.append((start, start + rng.uniform(10 * 60, 90 * 60)))
+    return outages
+
+
+def notification_latencies(timeline, messages):
+    """Задержки уведомлений о смене статуса и число пропущенных смен.
+
+    Смена пропущена, если до следующего опроса статус сменился ещё раз:
+    бот сообщает только последний.
+    """
+    latencies = []
+    missed = 0
+    for offset, homework_id, status in sorted(timeline):
+        name = f'"hw{homework_id}"'
+        verdict = homework.HOMEWORK_STATUSES[status]
+        sent = next(
+            (moment for moment, text in messages
+             if moment >= offset and name in text and verdict in text),
+            None,
+        )
+        if sent is None:
+            missed += 1
+        else:
+            latencies.append(sent - offset)
+    return sorted(latencies), missed
+
+
+def simulate(days=7, homeworks=20, outages=0, seed=0):
+    """Прогоняет days дней опроса и возвращает сводку."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    clock = VirtualClock(START_TIME)
+    timeline = make_timeline(homeworks, days, rng)
+    api = FakePracticum(clock, timeline, make_outages(outages, days, rng))
+    bot = FakeTelegram(clock)
+    shutdown = Shutdown(clock=clock)
+    poller = homework.Poller(bot, MemoryCheckpoint(), clock=clock, fetch=api)
+    memory = []
+    started = time.perf_counter()
+    tracemalloc.start()
+    try:
+        while clock.monotonic() < days * DAY:
+            poller.poll()
+            homework.sleep_until_next_cycle(
+                poller.scheduler.next_delay(), shutdown
+            )
+            if clock.monotonic() >= (len(memory) + 1) * DAY:
+                memory.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    wall = time.perf_counter() - started
+    latencies, missed = notification_latencies(timeline, bot.messages)
+    return {
+        "days": days,
+        "wall_seconds": wall,
+        "speedup": clock.monotonic() / wall,
+        "requests": api.requests,
+        "requests_per_day": api.requests / days,
+        "messages": len(bot.messages),
+        "notified": len(latencies),
+        "missed": missed,
+        "latency_p50_s": percentile(latencies, 0.5) if latencies else 0.0,
+        "latency_p99_s": percentile(latencies, 0.99) if latencies else 0.0,
+        "latency_max_s": latencies[-1] if latencies else 0.0,
+        "memory_growth_kib": (
+            (memory[-1] - memory[0]) / 1024 if len(memory) > 1 else 0.0
+        ),
+    }
+
+
+def main():
+    """Разбор аргументов командной строки и запуск симуляции."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--homeworks", type=int, default=20)
+    parser.add_argument("--outages", type=int, default=0,
+                        help="число окон недоступности API")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true",
+                        help="не отключать логирование бота")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    result = simulate(args.days, args.homeworks, args.outages, args.seed)
+    for key, value in result.items():
+        print(f"{key:>20}: {value:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
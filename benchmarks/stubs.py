@@ -0,0 +1,137 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STATUSES = ("approved", "reviewing", "rejected")
+
+
+def make_homeworks(count):
+    """Список работ в формате API Практикума."""
+    return [
+        {
+            "id": index,
+            "status": STATUSES[index % len(STATUSES)],
+            "homework_name": f"student__hw{index:05d}.zip",
+            "reviewer_comment": "Всё нравится",
+            "date_updated": "2020-02-13T14:40:57Z",
+            "lesson_name": f"Спринт {index}",
+        }
+        for index in range(count)
+    ]
+
+
+class StubServer:
+    """Локальный HTTP-сервер с настраиваемой задержкой и долей ошибок."""
+
+    def __init__(self, latency=0.0, error_rate=0.0):
+        """Сервер слушает случайный свободный порт на 127.0.0.1."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self):
+        """Базовый адрес сервера."""
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def respond(self, handler):
+        """Возвращает (код, тело) ответа; переопределяется наследниками."""
+        raise NotImplementedError
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _reply(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if random.random() < stub.error_rate:
+                    status, body = 500, b'{"error": "stub failure"}'
+                else:
+                    status, body = stub.respond(self)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                self._reply()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Запускает сервер в фоновом потоке."""
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class PracticumStub(StubServer):
+    """Заглушка эндпоинта homework_statuses."""
+
+    path = "/api/user_api/homework_statuses/"
+
+    def __init__(self, homeworks=1, **kwargs):
+        """homeworks — сколько работ отдавать в каждом ответе."""
+        super().__init__(**kwargs)
+        self.homeworks = make_homeworks(homeworks)
+
+    @property
+    def endpoint(self):
+        """Адрес, подставляемый вместо homework.ENDPOINT."""
+        return self.url + self.path
+
+    def respond(self, handler):
+        """Список работ и текущее время, как у настоящего API."""
+        body = {"homeworks": self.homeworks, "current_date": int(time.time())}
+        return 200, json.dumps(body, ensure_ascii=False).encode()
+
+
+class TelegramStub(StubServer):
+    """Заглушка метода sendMessage Bot API."""
+
+    def __init__(self, **kwargs):
+        """Считает отправленные сообщения."""
+        super().__init__(**kwargs)
+        self.message_id = 0
+
+    @property
+    def base_url(self):
+        """Значение base_url для telegram.Bot."""
+        return self.url + "/bot"
+
+    def respond(self, handler):
+        """Ответ sendMessage с минимальным объектом Message."""
+        self.message_id += 1
+        result = {
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": {"id": 1, "type": "private"},
+            "text": "",
+        }
+        return 200, json.dumps({"ok": True, "result": result}).encode()
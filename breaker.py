@@ -0,0 +1,88 @@
+import logging
+import time
+from collections import Counter
+
+from requests import RequestException
+
+from exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+FAILURE_THRESHOLD = 5
+RECOVERY_TIME = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Размыкает цепь после серии сбоев и отдаёт последний удачный ответ.
+
+    После каждого call() флаг served_from_cache говорит, пришёл ли
+    результат из кэша: такой ответ не означает, что API ожило.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD,
+                 recovery_time=RECOVERY_TIME,
+                 failure_types=(RequestException,), clock=time.monotonic,
+                 cacheable=None):
+        """Порог сбоев подряд и время до пробного запроса в секундах.
+
+        cacheable(result) решает, можно ли отдать результат повторно;
+        одноразовые ответы вызывающий кладёт в кэш сам через remember().
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failure_types = failure_types
+        self.clock = clock
+        self.cacheable = cacheable
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.cached = None
+        self.served_from_cache = False
+        self.transitions = Counter()
+        self.short_circuits = 0
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        logger.warning(f"Цепь API: {self.state} -> {state}")
+        self.transitions[(self.state, state)] += 1
+        self.state = state
+        if state == OPEN:
+            self.opened_at = self.clock()
+
+    def call(self, func, *args, **kwargs):
+        """Вызывает func через предохранитель."""
+        self.served_from_cache = False
+        if self.state == OPEN:
+            if self.clock() - self.opened_at < self.recovery_time:
+                return self._short_circuit()
+            self._set_state(HALF_OPEN)
+        try:
+            result = func(*args, **kwargs)
+        except self.failure_types:
+            self.failures += 1
+            if (self.state == HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                self._set_state(OPEN)
+            raise
+        self.failures = 0
+        if self.cacheable is None or self.cacheable(result):
+            self.cached = result
+        self._set_state(CLOSED)
+        return result
+
+    def remember(self, result):
+        """Кладёт в кэш ответ, который отдаётся при разомкнутой цепи."""
+        self.cached = result
+
+    def _short_circuit(self):
+        self.short_circuits += 1
+        if self.cached is None:
+            raise CircuitOpenError()
+        logger.debug("Цепь API разомкнута, используется кэш ответа")
+        self.served_from_cache = True
+        return self.cached
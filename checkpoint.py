@@ -0,0 +1,49 @@
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """Состояние бота в JSON-файле, переживающее перезапуск."""
+
+    def __init__(self, path):
+        """Читает сохранённое состояние, если файл уже есть."""
+        self.path = path
+        self.state = self._read()
+
+    def _read(self):
+        """Загружает состояние с диска, битый файл считается пустым."""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except ValueError as error:
+            logger.error(f"Повреждён файл состояния {self.path}: {error}")
+            return {}
+        if not isinstance(state, dict):
+            logger.error(f"Неожиданный формат файла состояния {self.path}")
+            return {}
+        return state
+
+    def get(self, key, default=None):
+        """Значение из сохранённого состояния."""
+        return self.state.get(key, default)
+
+    def update(self, **values):
+        """Обновляет состояние и атомарно записывает его на диск."""
+        self.state.update(values)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(self.state, file, ensure_ascii=False)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
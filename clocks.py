@@ -0,0 +1,54 @@
+import threading
+import time
+
+
+class Clock:
+    """Реальное время: источник времени для цикла опроса и клиента API.
+
+    Всё, что зависит от времени, берёт его отсюда, поэтому цикл можно
+    запустить на VirtualClock и прогнать неделю опросов за секунды.
+    """
+
+    def time(self):
+        """Unix-время в секундах."""
+        return time.time()
+
+    def monotonic(self):
+        """Монотонные секунды для интервалов."""
+        return time.monotonic()
+
+    def wait(self, event, timeout):
+        """Ждёт event не дольше timeout; True, если он выставлен."""
+        return event.wait(timeout)
+
+
+class VirtualClock(Clock):
+    """Время, которое идёт только по вызовам advance и wait."""
+
+    def __init__(self, start=0.0):
+        """Начальное unix-время; монотонное время начинается с нуля."""
+        self.start = start
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        """Unix-время в секундах."""
+        return self.start + self.elapsed
+
+    def monotonic(self):
+        """Секунды от создания часов."""
+        return self.elapsed
+
+    def advance(self, seconds):
+        """Сдвигает время вперёд."""
+        with self._lock:
+            self.elapsed += max(seconds, 0)
+
+    def wait(self, event, timeout):
+        """Пауза без ожидания: время сразу сдвигается на timeout."""
+        if not event.is_set():
+            self.advance(timeout)
+        return event.is_set()
+
+
+SYSTEM_CLOCK = Clock()
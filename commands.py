@@ -0,0 +1,74 @@
+import logging
+import time
+
+from telegram.ext import CommandHandler, Filters, Updater
+
+HISTORY_LIMIT = 10
+MAX_HISTORY_LIMIT = 50
+TIME_FORMAT = "%d.%m %H:%M"
+
+logger = logging.getLogger(__name__)
+
+
+def _format_time(timestamp):
+    return time.strftime(TIME_FORMAT, time.localtime(timestamp))
+
+
+def status_reply(cache):
+    """Ответ на /status из кэша статусов."""
+    statuses = cache.statuses()
+    if not statuses:
+        return "Статусов пока нет: бот ещё не видел ни одной работы."
+    lines = [f'"{entry["name"]}": {entry["verdict"]}' for entry in statuses]
+    if cache.checked_at is not None:
+        lines.append(f"Проверено: {_format_time(cache.checked_at)}")
+    return "\n".join(lines)
+
+
+def history_reply(cache, limit=HISTORY_LIMIT):
+    """Ответ на /history: последние смены статусов."""
+    entries = cache.recent(limit)
+    if not entries:
+        return "История пока пуста."
+    return "\n".join(
+        f'{_format_time(entry["time"])} "{entry["name"]}": {entry["status"]}'
+        for entry in entries
+    )
+
+
+def history_limit(args):
+    """Число записей из аргумента /history N."""
+    try:
+        limit = int(args[0])
+    except (IndexError, ValueError):
+        return HISTORY_LIMIT
+    return max(1, min(limit, MAX_HISTORY_LIMIT))
+
+
+def start_command_listener(token, chat_id, cache):
+    """Запускает приём команд /status и /history в фоновом потоке.
+
+    Отвечают только в чат chat_id; данные берутся из кэша, запросов
+    к API Практикума команды не делают. Возвращает Updater для stop().
+    """
+    updater = Updater(token=token, use_context=True)
+    only_owner = Filters.chat(chat_id=int(chat_id))
+
+    def on_status(update, context):
+        update.effective_message.reply_text(status_reply(cache))
+
+    def on_history(update, context):
+        update.effective_message.reply_text(
+            history_reply(cache, history_limit(context.args))
+        )
+
+    dispatcher = updater.dispatcher
+    dispatcher.add_handler(
+        CommandHandler("status", on_status, filters=only_owner)
+    )
+    dispatcher.add_handler(
+        CommandHandler("history", on_history, filters=only_owner)
+    )
+    updater.start_polling(drop_pending_updates=True)
+    logger.info("Команды /status и /history включены")
+    return updater
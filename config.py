@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import signal
+from collections import namedtuple
+
+from dotenv import dotenv_values
+
+DEFAULT_ENDPOINT = (
+    "https://practicum.yandex.ru/api/user_api/homework_statuses/"
+)
+DEFAULT_RETRY_TIME = 60
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10
+DEFAULT_STATUSES = {
+    "approved": "Работа проверена: ревьюеру всё понравилось. Ура!",
+    "reviewing": "Работа взята на проверку ревьюером.",
+    "rejected": "Работа проверена: у ревьюера есть замечания.",
+}
+
+# Окружение процесса до чтения .env: при перечитывании файла
+# его новые значения не должны перекрываться старыми.
+PROCESS_ENV = dict(os.environ)
+
+logger = logging.getLogger(__name__)
+
+Settings = namedtuple("Settings", (
+    "practicum_token",
+    "telegram_token",
+    "telegram_chat_id",
+    "telegram_chat_ids",
+    "retry_time",
+    "endpoint",
+    "homework_statuses",
+    "api_connect_timeout",
+    "api_read_timeout",
+    "api_hedging",
+    "api_streaming",
+    "log_format",
+    "log_sample_rate",
+    "log_mode",
+))
+
+
+def load_statuses(path):
+    """Шаблоны вердиктов из JSON-файла или встроенные по умолчанию."""
+    if not path:
+        return dict(DEFAULT_STATUSES)
+    with open(path, encoding="utf-8") as file:
+        statuses = json.load(file)
+    if not isinstance(statuses, dict):
+        raise TypeError(f"{path}: ожидается словарь статусов")
+    return statuses
+
+
+def parse_chat_ids(value):
+    """Получатели из строки через запятую: id чатов или @каналы."""
+    return tuple(
+        chat_id.strip() for chat_id in (value or "").split(",")
+        if chat_id.strip()
+    )
+
+
+def default_settings():
+    """Настройки без разбора значений и чтения файлов.
+
+    Токены и чаты берутся из окружения, остальное — по умолчанию.
+    Такие настройки не могут не собраться, поэтому годятся для импорта
+    модуля; полные собирает load_settings() при запуске бота.
+    """
+    return Settings(
+        practicum_token=os.getenv("PRACTICUM_TOKEN"),
+        telegram_token=os.getenv("TELEGRAM_TOKEN"),
+        telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID"),
+        telegram_chat_ids=parse_chat_ids(os.getenv("TELEGRAM_CHAT_IDS")),
+        retry_time=DEFAULT_RETRY_TIME,
+        endpoint=DEFAULT_ENDPOINT,
+        homework_statuses=dict(DEFAULT_STATUSES),
+        api_connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        api_read_timeout=DEFAULT_READ_TIMEOUT,
+        api_hedging=False,
+        api_streaming=False,
+        log_format="text",
+        log_sample_rate=1,
+        log_mode="sync",
+    )
+
+
+def load_settings(env_file):
+    """Собирает настройки из окружения процесса и файла .env."""
+    values = {**dotenv_values(env_file), **PROCESS_ENV}
+    return Settings(
+        practicum_token=values.get("PRACTICUM_TOKEN"),
+        telegram_token=values.get("TELEGRAM_TOKEN"),
+        telegram_chat_id=values.get("TELEGRAM_CHAT_ID"),
+        telegram_chat_ids=parse_chat_ids(values.get("TELEGRAM_CHAT_IDS")),
+        retry_time=int(values.get("RETRY_TIME", DEFAULT_RETRY_TIME)),
+        endpoint=values.get("ENDPOINT", DEFAULT_ENDPOINT),
+        homework_statuses=load_statuses(values.get("STATUSES_FILE")),
+        api_connect_timeout=float(
+            values.get("API_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)
+        ),
+        api_read_timeout=float(
+            values.get("API_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)
+        ),
+        api_hedging=values.get("API_HEDGING", "false").lower() == "true",
+        api_streaming=(
+            values.get("API_STREAMING", "false").lower() == "true"
+        ),
+        log_format=values.get("LOG_FORMAT", "text"),
+        log_sample_rate=int(values.get("LOG_SAMPLE_RATE", 1)),
+        log_mode=values.get("LOG_MODE", "sync"),
+    )
+
+
+class ConfigWatcher:
+    """Отмечает, что конфигурацию пора перечитать.
+
+    Срабатывает по SIGHUP или при изменении mtime любого из файлов.
+    Проверка дешёвая: несколько stat() раз за цикл опроса.
+    """
+
+    def __init__(self, *paths):
+        """Запоминает текущие mtime; несуществующие файлы допустимы."""
+        self.paths = [path for path in paths if path]
+        self.mtimes = self._mtimes()
+        self.requested = False
+
+    def _mtimes(self):
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def install_signal_handler(self):
+        """Перечитывать конфигурацию по kill -HUP."""
+        signal.signal(signal.SIGHUP, self._on_signal)
+
+    def _on_signal(self, signum, frame):
+        self.requested = True
+
+    def changed(self):
+        """Список изменившихся файлов; непустой и при SIGHUP."""
+        mtimes = self._mtimes()
+        changed = [
+            path for path in self.paths if mtimes[path] != self.mtimes[path]
+        ]
+        self.mtimes = mtimes
+        if self.requested:
+            self.requested = False
+            return changed or list(self.paths)
+        return changed
@@ -0,0 +1,387 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from telegram.error import BadRequest, RetryAfter, Unauthorized
+
+import metrics
+
+QUEUE_SIZE = 1000
+LANE_QUEUE_SIZE = 100
+GLOBAL_RATE = 30
+CHAT_RATE = 1
+BATCH_SIZE = 50
+MESSAGE_LIMIT = 4096
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 1
+LATENCIES_SIZE = 100
+REPLAY_INTERVAL = 60
+
+SENT = "sent"
+FAILED = "failed"
+REJECTED = "rejected"
+SKIPPED = "skipped"
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+DELIVERY_LATENCY = metrics.Histogram(
+    "homework_telegram_delivery_seconds",
+    "Время от постановки в очередь до доставки, по чатам",
+)
+DELIVERIES = metrics.Counter(
+    "homework_telegram_deliveries_total",
+    "Попытки доставки по чатам и результатам",
+)
+
+
+class TokenBucket:
+    """Ведро токенов: rate токенов в секунду, не больше capacity."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """Ведро создаётся полным."""
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Берёт токен; возвращает, сколько секунд ждать, если их нет."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+def _wait_for(bucket):
+    delay = bucket.take()
+    while delay:
+        time.sleep(delay)
+        delay = bucket.take()
+
+
+class Lane:
+    """Очередь и поток отправки одного чата.
+
+    У каждого получателя свои ведро токенов, повторы и метрики,
+    поэтому медленный или ограниченный Телеграмом чат задерживает
+    только свои сообщения. Очередь ограничена maxsize: пока чат
+    недоступен, память не растёт, лишнее отбрасывается (и остаётся
+    в журнале outbox для повтора).
+    """
+
+    def __init__(self, owner, chat_id, rate, maxsize=LANE_QUEUE_SIZE):
+        """Поток запускается сразу."""
+        self.owner = owner
+        self.chat_id = chat_id
+        self.bucket = TokenBucket(rate)
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.latency = DELIVERY_LATENCY.labels(chat=chat_id)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.thread = threading.Thread(
+            target=self._run, name=f"telegram-{chat_id}", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            text, enqueued, keys = item
+            if self.owner._delivered(keys):
+                logger.info(f"Сообщение в чат {self.chat_id} уже доставлено")
+                self.owner._finish(keys, SKIPPED)
+                continue
+            self.owner._finish(keys, self.deliver(text, enqueued))
+
+    def deliver(self, text, enqueued):
+        """Отправляет с повторами; SENT, FAILED или REJECTED.
+
+        Сетевые и прочие временные ошибки повторяются с паузой
+        RETRY_DELAY, удваивающейся с каждой попыткой; на BadRequest и
+        Unauthorized повтор ничего не изменит, поэтому попытки прекращаются
+        и сообщение считается отвергнутым (REJECTED).
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            if attempt:
+                self.retries += 1
+                DELIVERIES.inc(chat=self.chat_id, result="retry")
+            _wait_for(self.owner.global_bucket)
+            _wait_for(self.bucket)
+            try:
+                self.owner.bot.send_message(self.chat_id, text)
+            except RetryAfter as error:
+                logger.warning(
+                    f"Телеграм просит паузу {error.retry_after} s "
+                    f"для чата {self.chat_id}"
+                )
+                time.sleep(error.retry_after)
+                continue
+            except (BadRequest, Unauthorized) as error:
+                logger.error(
+                    f"Телеграм отверг сообщение в чат {self.chat_id}, "
+                    f"повторов не будет: {error}"
+                )
+                self.failed += 1
+                DELIVERIES.inc(chat=self.chat_id, result=REJECTED)
+                return REJECTED
+            except Exception as error:
+                logger.warning(
+                    f"Сбой отправки в чат {self.chat_id}, "
+                    f"попытка {attempt + 1} из {MAX_ATTEMPTS}: {error}"
+                )
+                if attempt + 1 < MAX_ATTEMPTS:
+                    time.sleep(RETRY_DELAY * 2 ** attempt)
+                continue
+            latency = time.monotonic() - enqueued
+            self.sent += 1
+            self.latency.observe(latency)
+            self.owner.latencies.append(latency)
+            DELIVERIES.inc(chat=self.chat_id, result=SENT)
+            return SENT
+        self.failed += 1
+        DELIVERIES.inc(chat=self.chat_id, result=FAILED)
+        return FAILED
+
+    def stats(self):
+        """Счётчики и p95 задержки доставки в этот чат."""
+        return {
+            "depth": self.queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "latency_p95": self.latency.percentile(0.95),
+        }
+
+
+class MessageQueue:
+    """Очередь исходящих сообщений с отдельным потоком отправки.
+
+    Повторяет интерфейс bot.send_message, поэтому send_message()
+    работает с ней так же, как с самим ботом, но не ждёт Телеграм.
+    Поток очереди склеивает сообщения и раздаёт их по Lane — у каждого
+    чата свой поток, так что рассылка нескольким получателям идёт
+    параллельно. С журналом outbox сообщения сначала записываются на диск, а
+    неотправленные раз в REPLAY_INTERVAL ставятся в очередь повторно.
+    """
+
+    def __init__(self, bot, maxsize=QUEUE_SIZE, global_rate=GLOBAL_RATE,
+                 chat_rate=CHAT_RATE, outbox=None,
+                 lane_size=LANE_QUEUE_SIZE):
+        """Оборачивает бота; поток запускается методом start().
+
+        maxsize ограничивает общую очередь, lane_size — очередь
+        каждого чата.
+        """
+        self.bot = bot
+        self.outbox = outbox
+        self.in_flight = set()
+        self._lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.lane_size = lane_size
+        self.lanes = {}
+        self.latencies = deque(maxlen=LATENCIES_SIZE)
+        self.dropped = 0
+        self.thread = threading.Thread(
+            target=self._run, name="telegram-sender", daemon=True
+        )
+        self.replayer = threading.Thread(
+            target=self._replay_loop, name="outbox-replay", daemon=True
+        )
+
+    def start(self):
+        """Запускает поток отправки и, с журналом, поток повторов."""
+        self.thread.start()
+        if self.outbox is not None:
+            self.replayer.start()
+        return self
+
+    def send_message(self, chat_id, text, key=None):
+        """Ставит сообщение в очередь и сразу возвращает управление.
+
+        key — ключ идемпотентности для журнала: сообщение с уже
+        записанным или доставленным ключом второй раз не ставится.
+        """
+        if self.outbox is not None:
+            key = self.outbox.add(chat_id, text, key)
+            if key is None:
+                return
+        self._enqueue(chat_id, text, key)
+
+    def _enqueue(self, chat_id, text, key):
+        """Ставит сообщение в очередь; False, если оно уже в пути."""
+        keys = ()
+        if key is not None:
+            # Проверка и пометка под одной блокировкой: иначе повтор
+            # из журнала может поставить сообщение, которое Lane как раз
+            # доставила и сняла с in_flight.
+            with self._lock:
+                if key in self.in_flight or self._delivered((key,)):
+                    return False
+                self.in_flight.add(key)
+            keys = (key,)
+        try:
+            self.queue.put_nowait((chat_id, text, time.monotonic(), keys))
+        except queue.Full:
+            self.dropped += 1
+            with self._lock:
+                self.in_flight.difference_update(keys)
+            logger.error(f"Очередь сообщений переполнена: {text}")
+            return False
+        return True
+
+    def replay(self):
+        """Ставит в очередь неотправленные сообщения из журнала."""
+        replayed = sum(
+            self._enqueue(entry["chat_id"], entry["text"], entry["key"])
+            for entry in self.outbox.pending()
+        )
+        if replayed:
+            logger.info(f"Повторная отправка из журнала: {replayed}")
+
+    def _replay_loop(self):
+        while True:
+            self.replay()
+            if self.stopping.wait(REPLAY_INTERVAL):
+                return
+
+    def stop(self, timeout=None):
+        """Досылает накопленное и останавливает потоки.
+
+        Возвращает False, если за timeout очереди не успели опустеть.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.stopping.set()
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+        for lane in list(self.lanes.values()):
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            lane.thread.join(remaining)
+        lanes = list(self.lanes.values())
+        return not any(
+            thread.is_alive()
+            for thread in [self.thread] + [lane.thread for lane in lanes]
+        )
+
+    def stats(self):
+        """Глубина очередей, счётчики и задержка доставки.
+
+        В destinations — то же по каждому чату.
+        """
+        latencies = sorted(self.latencies)
+        destinations = {
+            chat_id: lane.stats()
+            for chat_id, lane in list(self.lanes.items())
+        }
+        return {
+            "depth": self.queue.qsize() + sum(
+                lane["depth"] for lane in destinations.values()
+            ),
+            "sent": sum(lane["sent"] for lane in destinations.values()),
+            "dropped": self.dropped,
+            "failed": sum(lane["failed"] for lane in destinations.values()),
+            "latency_avg": (
+                sum(latencies) / len(latencies) if latencies else None
+            ),
+            "latency_max": latencies[-1] if latencies else None,
+            "destinations": destinations,
+        }
+
+    def _run(self):
+        while True:
+            items = [self.queue.get()]
+            while len(items) < BATCH_SIZE and items[-1] is not _STOP:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = items[-1] is _STOP
+            if stop:
+                items.pop()
+            for batch in self._batch(items):
+                self._dispatch(*batch)
+            if stop:
+                for lane in self.lanes.values():
+                    lane.queue.put(_STOP)
+                return
+
+    def _dispatch(self, chat_id, text, enqueued, keys):
+        """Передаёт сообщение в Lane чата; при переполнении отбрасывает."""
+        lane = self.lanes.get(chat_id)
+        if lane is None:
+            lane = Lane(self, chat_id, self.chat_rate, self.lane_size)
+            self.lanes[chat_id] = lane
+        try:
+            lane.queue.put_nowait((text, enqueued, keys))
+        except queue.Full:
+            lane.dropped += 1
+            self.dropped += 1
+            with self._lock:
+                self.in_flight.difference_update(keys)
+            logger.error(f"Очередь чата {chat_id} переполнена: {text}")
+
+    def _delivered(self, keys):
+        """Все сообщения с ключами keys уже отмечены в журнале."""
+        return (
+            bool(keys) and self.outbox is not None
+            and all(self.outbox.is_done(key) for key in keys)
+        )
+
+    def _finish(self, keys, result):
+        """Вызывается из Lane после попытки доставки.
+
+        Отвергнутое Телеграмом тоже закрывается в журнале: иначе повтор
+        из журнала слал бы его раз в REPLAY_INTERVAL бесконечно. Ключ
+        сначала отмечается в журнале и только потом снимается с
+        in_flight, так что _enqueue видит его хотя бы в одном из мест.
+        """
+        if self.outbox is not None and result == SENT:
+            self.outbox.mark_done(keys)
+        elif self.outbox is not None and result == REJECTED:
+            self.outbox.mark_done(keys, op=REJECTED)
+        with self._lock:
+            self.in_flight.difference_update(keys)
+
+    @staticmethod
+    def _batch(items):
+        """Склеивает сообщения одного чата до MESSAGE_LIMIT.
+
+        Порядок сообщений внутри чата сохраняется; чаты доставляются
+        независимо, поэтому их взаимный порядок не важен.
+        """
+        batches = []
+        last = {}
+        for chat_id, text, enqueued, keys in items:
+            index = last.get(chat_id)
+            if index is not None:
+                _, last_text, last_enqueued, last_keys = batches[index]
+                joined = f"{last_text}\n\n{text}"
+                if len(joined) <= MESSAGE_LIMIT:
+                    batches[index] = (
+                        chat_id, joined, last_enqueued, last_keys + keys
+                    )
+                    continue
+            last[chat_id] = len(batches)
+            batches.append((chat_id, text, enqueued, keys))
+        return batches
@@ -0,0 +1,59 @@
+import re
+import time
+from collections import OrderedDict
+
+SUPPRESS_TIME = 15 * 60
+MAX_ERRORS = 128
+
+NUMBERS = re.compile(r"\d+")
+RECOVERED_MESSAGE = "Работа бота восстановлена, API Практикума отвечает."
+
+
+class ErrorNotifier:
+    """Глушит повторы одинаковых ошибок и сводит их в дайджест."""
+
+    def __init__(self, suppress_time=SUPPRESS_TIME, max_errors=MAX_ERRORS,
+                 clock=time.monotonic):
+        """Окно подавления в секундах и размер LRU-кэша ошибок."""
+        self.suppress_time = suppress_time
+        self.max_errors = max_errors
+        self.clock = clock
+        self.errors = OrderedDict()
+
+    @staticmethod
+    def key(error, message):
+        """Класс ошибки и текст без чисел: таймстемпы, коды, порты."""
+        return type(error).__name__, NUMBERS.sub("#", message)
+
+    def report(self, error, message):
+        """Текст для отправки или None, если повтор надо подавить."""
+        now = self.clock()
+        key = self.key(error, message)
+        entry = self.errors.get(key)
+        if entry is None:
+            self.errors[key] = {"sent_at": now, "repeats": 0}
+            if len(self.errors) > self.max_errors:
+                self.errors.popitem(last=False)
+            return message
+
+        self.errors.move_to_end(key)
+        elapsed = now - entry["sent_at"]
+        if elapsed < self.suppress_time:
+            entry["repeats"] += 1
+            return None
+
+        repeats = entry["repeats"]
+        entry.update(sent_at=now, repeats=0)
+        if not repeats:
+            return message
+        return (
+            f"{message}\nПовторилось {repeats} раз "
+            f"за последние {round(elapsed / 60)} мин."
+        )
+
+    def recovered(self):
+        """Сообщение о восстановлении, если до этого были ошибки."""
+        if not self.errors:
+            return None
+        self.errors.clear()
+        return RECOVERED_MESSAGE
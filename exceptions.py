@@ -4,3 +4,11 @@ class TokenError(Exception):
     def __init__(self, message='Invalid or unavailable tokens'):
         self.message = message
         super().__init__(self.message)
+
+
+class CircuitOpenError(Exception):
+    """Raised when the API circuit is open and there is no cached answer."""
+
+    def __init__(self, message='Practicum API circuit is open'):
+        self.message = message
+        super().__init__(self.message)
@@ -1,58 +1,160 @@
 import logging
 import os
+import sys
 import time
-from logging.config import fileConfig
 
 import requests
 from dotenv import load_dotenv
 from requests import HTTPError
-from telegram import Bot
 
+import api_client
+import config
+import json_stream
+import log_setup
+import metrics
+from breaker import CircuitBreaker
+from checkpoint import CheckpointStore
+from clocks import SYSTEM_CLOCK
+from error_notifier import ErrorNotifier
 from exceptions import TokenError
-
-load_dotenv()
-
-PRACTICUM_TOKEN = os.getenv("PRACTICUM_TOKEN")
-TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
-
-RETRY_TIME = 60
+from lease import LeaderElector, create_backend
+from outbox import Outbox
+from profiler import Profiler
+from recording import Recorder
+from scheduler import PollScheduler
+from shutdown import DRAIN_TIMEOUT, Shutdown
+from status_cache import StatusCache
+from tracker import StatusTracker
+from validator import ResponseValidator
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGGING_CONFIG = os.path.join(BASE_DIR, "logging_config.ini")
+ENV_FILE = os.path.join(BASE_DIR, ".env")
+
+# .env только дополняет os.environ и не падает на плохих значениях;
+# разбор настроек и STATUSES_FILE ждёт load_config() при запуске бота.
+load_dotenv(ENV_FILE)
+settings = config.default_settings()
+
+PRACTICUM_TOKEN = settings.practicum_token
+TELEGRAM_TOKEN = settings.telegram_token
+TELEGRAM_CHAT_ID = settings.telegram_chat_id
+TELEGRAM_CHAT_IDS = settings.telegram_chat_ids
+CHECKPOINT_FILE = os.getenv("CHECKPOINT_FILE", "checkpoint.json")
+METRICS_PORT = os.getenv("METRICS_PORT")
+OUTBOX_FILE = os.getenv("OUTBOX_FILE", "outbox.jsonl")
+LEASE_BACKEND = os.getenv("LEASE_BACKEND", "none")
+STATUSES_FILE = os.getenv("STATUSES_FILE")
+RECORD_FILE = os.getenv("RECORD_FILE")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_CYCLES = os.getenv("PROFILE_CYCLES")
+TELEGRAM_COMMANDS = os.getenv("TELEGRAM_COMMANDS", "false").lower() == "true"
+
+RETRY_TIME = settings.retry_time
+API_CONNECT_TIMEOUT = settings.api_connect_timeout
+API_READ_TIMEOUT = settings.api_read_timeout
+API_HEDGING = settings.api_hedging
+API_STREAMING = settings.api_streaming
 BEGINNING_TIME = 1
-ENDPOINT = "https://practicum.yandex.ru/api/user_api/homework_statuses/"
+ENDPOINT = settings.endpoint
 HEADERS = {"Authorization": f"OAuth {PRACTICUM_TOKEN}"}
 
+HOMEWORK_STATUSES = settings.homework_statuses
+VALIDATOR = ResponseValidator(HOMEWORK_STATUSES)
+PROFILER = Profiler(PROFILE_DIR)
 
-HOMEWORK_STATUSES = {
-    "approved": "Работа проверена: ревьюеру всё понравилось. Ура!",
-    "reviewing": "Работа взята на проверку ревьюером.",
-    "rejected": "Работа проверена: у ревьюера есть замечания.",
-}
 
-
-fileConfig("logging_config.ini")
 logger = logging.getLogger(__name__)
+_config_loaded = False
+_logging_configured = False
+_log_listener = None
+
+API_LATENCY = metrics.Histogram(
+    "homework_api_request_seconds", "Длительность get_api_answer"
+)
+SEND_LATENCY = metrics.Histogram(
+    "homework_send_message_seconds", "Длительность send_message"
+)
+CYCLE_ERRORS = metrics.Counter(
+    "homework_cycle_errors_total", "Ошибки цикла main() по классу исключения"
+)
+LOOP_LAG = metrics.Gauge(
+    "homework_loop_lag_seconds", "Насколько пауза цикла длиннее плановой"
+)
+LAST_SUCCESS_AGE = metrics.Gauge(
+    "homework_last_success_age_seconds", "Время с последнего удачного опроса"
+)
 
 
 def send_message(bot, message):
-    """Отправка сообщения в Телеграм."""
-    bot.send_message(TELEGRAM_CHAT_ID, message)
+    """Отправка сообщения всем получателям из TELEGRAM_CHAT_IDS.
+
+    Без списка получателей сообщение уходит в TELEGRAM_CHAT_ID. С
+    delivery.MessageQueue рассылка по чатам идёт параллельно.
+    """
+    for chat_id in recipients():
+        send_message_to(bot, chat_id, message)
+
+
+def recipients():
+    """Чаты, в которые рассылаются уведомления."""
+    return TELEGRAM_CHAT_IDS or (TELEGRAM_CHAT_ID,)
+
+
+def send_message_to(bot, chat_id, message, key=None):
+    """Отправка сообщения в указанный чат Телеграма.
+
+    key — ключ идемпотентности; его понимает только бот с журналом
+    (delivery.MessageQueue с outbox), остальным он не передаётся.
+    """
+    with SEND_LATENCY.time():
+        if key is not None and getattr(bot, "outbox", None) is not None:
+            bot.send_message(chat_id, message, key=key)
+        else:
+            bot.send_message(chat_id, message)
     logger.info("Telegram message sent")
 
 
 def get_api_answer(current_timestamp):
     """Запрос к эндпоинту API."""
+    with API_LATENCY.time():
+        return fetch_api_answer(current_timestamp, HEADERS)
+
+
+def stream_api_answer(current_timestamp):
+    """Запрос к эндпоинту API с потоковым чтением ответа."""
+    with API_LATENCY.time():
+        return fetch_api_answer(current_timestamp, HEADERS, stream=True)
+
+
+def fetch_api_answer(current_timestamp, headers, stream=False):
+    """Запрос к эндпоинту API с заголовками конкретного токена.
+
+    При stream=True тело не читается целиком: возвращается
+    json_stream.ObjectStream, отдающий работы по одной.
+    """
     timestamp = current_timestamp or int(time.time())
     params = {"from_date": timestamp}
 
-    homework_statuses = requests.get(ENDPOINT, headers=HEADERS, params=params)
+    http = api_client.current_client() or requests
+    homework_statuses = http.get(
+        ENDPOINT,
+        headers=headers,
+        params=params,
+        timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+        stream=stream,
+    )
     logger.info("Произошел запрос к API")
 
     if homework_statuses.status_code != 200:
         homework_statuses.raise_for_status()
+    if stream:
+        return json_stream.stream_response(homework_statuses)
 
     logger.info("Worked out function get_api_answer")
     try:
-        return homework_statuses.json()
+        with PROFILER.stage("parse"):
+            return homework_statuses.json()
     except Exception:
         message = "Ответвет API не json"
         logger.error(message)
@@ -60,15 +162,10 @@ def get_api_answer(current_timestamp):
 
 def check_response(response):
     """Проверяет API на корректность."""
-    if not isinstance(response, dict):
-        logger.error("В функцию check_response пришёл не словарь")
-        raise TypeError(
-            "Unexpected response in check_response function, dict expected"
-        )
-    homeworks = check_key_in_dict(response, "homeworks")
-    if not isinstance(homeworks, list):
-        logger.error("Словарь homeworks содержит значения не в виде массива")
-        raise TypeError("homeworks dictionary contains non-tuple values")
+    homeworks, error = VALIDATOR.envelope(response)
+    if error is not None:
+        logger.error(error.message)
+        raise error.exception()
     logger.info("Worked out function check_response")
     return homeworks
 
@@ -85,16 +182,181 @@ def check_key_in_dict(dictionary, key):
 
 def parse_status(homework):
     """Извлекает информацию о конкретной домашней работе."""
-    if not isinstance(homework, dict):
-        raise TypeError(
-            "Unexpected response in parse_status function, dict expected"
-        )
-    homework_name = check_key_in_dict(homework, "homework_name")
-    homework_status = check_key_in_dict(homework, "status")
-    verdict = check_key_in_dict(HOMEWORK_STATUSES, homework_status)
-
+    record, error = VALIDATOR.item(homework)
+    if error is not None:
+        logger.error(error.message)
+        raise error.exception()
     logger.info("Worked out function parse_status")
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return format_status(record)
+
+
+def format_status(record):
+    """Текст уведомления для проверенной записи validator.Homework."""
+    return (
+        f'Изменился статус проверки работы "{record.name}". {record.verdict}'
+    )
+
+
+def error_message(error):
+    """Текст уведомления об ошибке цикла опроса."""
+    if isinstance(error, HTTPError):
+        return f"API Практикума недоступна {error}"
+    if isinstance(error, TypeError):
+        return f"Неожиданный формат данных {error}"
+    if isinstance(error, KeyError):
+        return f"Отсутствует ключ {error}"
+    return f"Сбой в работе программы: {error}"
+
+
+def notify_changes(bot, tracker, homeworks, cache=None):
+    """Отправляет сообщения только о сменившихся статусах.
+
+    homeworks — записи validator.Homework, уже прошедшие проверку;
+    новые статусы попадают и в кэш для команд /status и /history.
+    """
+    with PROFILER.stage("validate"):
+        changes = tracker.changes(homeworks)
+    for homework in changes:
+        with PROFILER.stage("render"):
+            message = format_status(homework)
+        with PROFILER.stage("send"):
+            # Ключ повторяется для той же смены статуса, поэтому после
+            # падения до записи checkpoint журнал не отправит её дважды.
+            # Без date_updated ключа нет: лучше повтор, чем пропуск.
+            transition = homework.transition
+            for chat_id in recipients():
+                send_message_to(
+                    bot, chat_id, message,
+                    key=transition and f"{chat_id}:{transition}",
+                )
+        tracker.remember(homework)
+        if cache is not None:
+            cache.record(homework)
+    return len(changes)
+
+
+def sleep_until_next_cycle(delay, shutdown):
+    """Пауза между циклами; прерывается сигналом остановки."""
+    started = shutdown.clock.monotonic()
+    if not shutdown.wait(delay):
+        LOOP_LAG.set(shutdown.clock.monotonic() - started - delay)
+
+
+def setup_logging(reload=False):
+    """Настраивает логирование при первом запуске, а не при импорте."""
+    global _logging_configured, _log_listener
+    if _logging_configured and not reload:
+        return
+    from logging.config import fileConfig
+
+    if _log_listener is not None:
+        log_setup.stop_listener(_log_listener)
+    fileConfig(LOGGING_CONFIG, disable_existing_loggers=False)
+    _log_listener = log_setup.configure(
+        settings.log_format, settings.log_sample_rate, settings.log_mode
+    )
+    _logging_configured = True
+
+
+def load_config():
+    """Собирает настройки из .env и STATUSES_FILE при первом запуске.
+
+    Ошибка в файлах проявляется при старте бота, а не при импорте
+    модуля тестами, бенчмарками или tenants.
+    """
+    global _config_loaded
+    if _config_loaded:
+        return
+    apply_settings(config.load_settings(ENV_FILE))
+    _config_loaded = True
+
+
+def apply_settings(new_settings):
+    """Подменяет настройки модуля; вызывается между циклами опроса."""
+    global settings, PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
+    global TELEGRAM_CHAT_IDS
+    global RETRY_TIME, ENDPOINT, HEADERS, HOMEWORK_STATUSES, VALIDATOR
+    global API_CONNECT_TIMEOUT, API_READ_TIMEOUT, API_HEDGING, API_STREAMING
+    settings = new_settings
+    PRACTICUM_TOKEN = new_settings.practicum_token
+    TELEGRAM_TOKEN = new_settings.telegram_token
+    TELEGRAM_CHAT_ID = new_settings.telegram_chat_id
+    TELEGRAM_CHAT_IDS = new_settings.telegram_chat_ids
+    RETRY_TIME = new_settings.retry_time
+    ENDPOINT = new_settings.endpoint
+    HEADERS = {"Authorization": f"OAuth {PRACTICUM_TOKEN}"}
+    HOMEWORK_STATUSES = new_settings.homework_statuses
+    VALIDATOR = ResponseValidator(HOMEWORK_STATUSES)
+    API_CONNECT_TIMEOUT = new_settings.api_connect_timeout
+    API_READ_TIMEOUT = new_settings.api_read_timeout
+    API_HEDGING = new_settings.api_hedging
+    API_STREAMING = new_settings.api_streaming
+
+
+def create_bot():
+    """Бот Телеграма с пулом соединений на каждого получателя.
+
+    Каждый чат delivery.MessageQueue обслуживает свой поток; с пулом
+    PTB по умолчанию (одно соединение) параллельная рассылка теряла бы
+    keep-alive почти на каждой отправке.
+    """
+    from telegram import Bot
+    from telegram.utils.request import Request
+
+    return Bot(
+        token=TELEGRAM_TOKEN,
+        request=Request(con_pool_size=len(recipients())),
+    )
+
+
+def create_api_client():
+    """Клиент API с текущими таймаутами, ставится текущим."""
+    client = api_client.PracticumClient(
+        connect_timeout=API_CONNECT_TIMEOUT,
+        read_timeout=API_READ_TIMEOUT,
+        hedging=API_HEDGING,
+    )
+    api_client.use_client(client)
+    return client
+
+
+def reload_config(modified, bot, client, scheduler):
+    """Перечитывает изменившуюся конфигурацию; возвращает клиента API.
+
+    Новые настройки собираются целиком и только потом применяются,
+    поэтому ошибка в файле оставляет бота на прежних.
+    """
+    try:
+        new_settings = config.load_settings(ENV_FILE)
+    except Exception as error:
+        logger.error(f"Конфигурация не перечитана: {error}")
+        if LOGGING_CONFIG in modified:
+            setup_logging(reload=True)
+        return client
+    old_settings = settings
+    apply_settings(new_settings)
+    log_fields = ("log_format", "log_sample_rate", "log_mode")
+    if (LOGGING_CONFIG in modified
+            or settings_changed(old_settings, new_settings, log_fields)):
+        setup_logging(reload=True)
+    logger.info("Конфигурация перечитана")
+    scheduler.base_interval = RETRY_TIME
+    bot_fields = ("telegram_token", "telegram_chat_id", "telegram_chat_ids")
+    if settings_changed(old_settings, new_settings, bot_fields):
+        bot.bot = create_bot()
+    api_fields = ("api_connect_timeout", "api_read_timeout", "api_hedging")
+    if settings_changed(old_settings, new_settings, api_fields):
+        client.close()
+        client = create_api_client()
+    return client
+
+
+def settings_changed(old_settings, new_settings, fields):
+    """True, если хотя бы одно из полей fields изменилось."""
+    return any(
+        getattr(new_settings, field) != getattr(old_settings, field)
+        for field in fields
+    )
 
 
 def check_tokens():
@@ -102,45 +364,174 @@ def check_tokens():
     return all((PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID))
 
 
+def is_reusable(response):
+    """Ответ API можно прочитать ещё раз: это не одноразовый поток."""
+    return not isinstance(response, json_stream.ObjectStream)
+
+
+class Poller:
+    """Состояние основного цикла: метка времени, статусы, ошибки."""
+
+    def __init__(self, bot, checkpoint, clock=SYSTEM_CLOCK, fetch=None):
+        """Восстанавливает метку времени и статусы из checkpoint.
+
+        clock — источник времени для пауз, выключателя и дайджеста
+        ошибок; fetch подменяет запрос к API, например в симуляции.
+        """
+        self.bot = bot
+        self.checkpoint = checkpoint
+        self.clock = clock
+        self.fetch = fetch
+        self.current_timestamp = checkpoint.get(
+            "current_date", BEGINNING_TIME
+        )
+        self.tracker = StatusTracker(checkpoint.get("statuses"))
+        self.cache = StatusCache.restore(
+            checkpoint.get("cache"), clock=clock.time
+        )
+        self.notifier = ErrorNotifier(clock=clock.monotonic)
+        self.scheduler = PollScheduler(
+            base_interval=RETRY_TIME, clock=clock.monotonic
+        )
+        self.breaker = CircuitBreaker(
+            clock=clock.monotonic, cacheable=is_reusable
+        )
+        self.last_success = clock.monotonic()
+
+    def poll(self):
+        """Один цикл: запрос, проверка ответа, уведомления."""
+        try:
+            fetch = self.fetch or (
+                stream_api_answer if API_STREAMING else get_api_answer
+            )
+            with PROFILER.stage("fetch"):
+                response = self.breaker.call(fetch, self.current_timestamp)
+            from_cache = self.breaker.served_from_cache
+            errors = []
+            homeworks = VALIDATOR.iter_records(response, errors)
+            changed = notify_changes(
+                self.bot, self.tracker, homeworks, self.cache
+            )
+            # С битой работой в ответе метка времени не сдвигается:
+            # работа придёт снова, а уже отправленные отсеет tracker.
+            if not errors:
+                self.current_timestamp = (
+                    response.get("current_date") or int(self.clock.time())
+                )
+                if not is_reusable(response):
+                    # Поток уже прочитан: выключателю остаётся конверт
+                    # без работ, сами работы уже прошли через tracker.
+                    self.breaker.remember(response.envelope())
+            self.save()
+            for error in errors[1:]:
+                logger.error(f"{error.path}: {error.message}")
+            if errors:
+                raise errors[0].exception()
+        except Exception as error:
+            self.on_error(error)
+        else:
+            if from_cache:
+                logger.debug("API недоступно, цикл отработал на кэше")
+            else:
+                self.on_success(changed)
+
+    def on_error(self, error):
+        """Логирует ошибку и сообщает о ней без повторов."""
+        message = error_message(error)
+        logger.error(message)
+        CYCLE_ERRORS.inc(error=type(error).__name__)
+        notice = self.notifier.report(error, message)
+        if notice:
+            send_message(self.bot, notice)
+        self.scheduler.record_failure(error)
+
+    def on_success(self, changed):
+        """Учитывает удачный цикл в расписании и уведомлениях."""
+        logger.debug("Цикл main успешен")
+        self.last_success = self.clock.monotonic()
+        self.cache.touch()
+        self.scheduler.record_success(
+            changed, "reviewing" in self.tracker.statuses.values()
+        )
+        notice = self.notifier.recovered()
+        if notice:
+            send_message(self.bot, notice)
+
+    def save(self):
+        """Записывает метку времени и статусы на диск."""
+        self.checkpoint.update(
+            current_date=self.current_timestamp,
+            statuses=self.tracker.statuses,
+            cache=self.cache.snapshot(),
+        )
+
+    def last_success_age(self):
+        """Секунды с последнего удачного цикла."""
+        return self.clock.monotonic() - self.last_success
+
+
 def main():
     """Основная логика работы бота."""
+    from delivery import MessageQueue
+
+    load_config()
+    setup_logging()
     if not check_tokens():
         logger.error(TokenError)
         raise TokenError()
-    bot = Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = BEGINNING_TIME
-
-    while True:
-        try:
-            response = get_api_answer(current_timestamp)
-            homeworks = check_response(response)
-            if homeworks:
-                result = parse_status(homeworks[0])
-                send_message(bot, result)
-            current_timestamp = response.get("current_date")
-
-        except HTTPError as error:
-            logger.error(f"API not available {error}")
-            send_message(bot, f"API Практикума недоступна {error}")
-
-        except TypeError as error:
-            message = f"Неожиданный формат данных {error}"
-            logger.error(message)
-            send_message(bot, message)
-
-        except KeyError as error:
-            message = f"Отсутствует ключ {error}"
-            logger.error(message)
-            send_message(bot, message)
+    shutdown = Shutdown().install()
+    elector = LeaderElector(
+        create_backend(LEASE_BACKEND), on_lost=shutdown.request
+    )
+    if not elector.wait_for_leadership(shutdown):
+        return
+    outbox = Outbox(OUTBOX_FILE)
+    bot = MessageQueue(create_bot(), outbox=outbox).start()
+    client = create_api_client()
+    watcher = config.ConfigWatcher(ENV_FILE, LOGGING_CONFIG, STATUSES_FILE)
+    watcher.install_signal_handler()
+    PROFILER.install_signal_handler()
+    if PROFILE_CYCLES:
+        PROFILER.request(int(PROFILE_CYCLES))
+    poller = Poller(bot, CheckpointStore(CHECKPOINT_FILE))
+    LAST_SUCCESS_AGE.set_function(poller.last_success_age)
+    if METRICS_PORT:
+        metrics.start_http_server(int(METRICS_PORT))
+    recorder = None
+    if RECORD_FILE:
+        recorder = Recorder(
+            RECORD_FILE, secrets=(PRACTICUM_TOKEN, TELEGRAM_TOKEN)
+        ).install(sys.modules[__name__])
+    commands = None
+    if TELEGRAM_COMMANDS:
+        from commands import start_command_listener
+
+        commands = start_command_listener(
+            TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, poller.cache
+        )
 
-        except Exception as error:
-            message = f"Сбой в работе программы: {error}"
-            logger.error(message)
-            send_message(bot, message)
-        else:
-            logger.debug("Цикл main успешен")
-        finally:
-            time.sleep(RETRY_TIME)
+    try:
+        while not shutdown.requested:
+            modified = watcher.changed()
+            if modified:
+                client = reload_config(
+                    modified, bot, client, poller.scheduler
+                )
+            with PROFILER.cycle():
+                poller.poll()
+            sleep_until_next_cycle(poller.scheduler.next_delay(), shutdown)
+    finally:
+        logger.info("Остановка бота")
+        poller.save()
+        if commands is not None:
+            commands.stop()
+        if recorder is not None:
+            recorder.close()
+        if not bot.stop(timeout=DRAIN_TIMEOUT):
+            logger.error(f"Очередь не досылалась дольше {DRAIN_TIMEOUT} s")
+        outbox.close()
+        client.close()
+        elector.release()
 
 
 if __name__ == "__main__":
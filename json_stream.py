@@ -0,0 +1,156 @@
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 16 * 1024
+MAX_VALUE_SIZE = 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[-+.eE0-9]*")
+_decoder = json.JSONDecoder()
+
+
+class ObjectStream:
+    """JSON-объект ответа, читаемый по кускам байтов.
+
+    Элементы массива под ключом key отдаются по одному при итерации
+    и нигде не накапливаются, поэтому память не растёт с размером
+    ответа. Остальные поля верхнего уровня собираются в fields и
+    доступны через get() после итерации.
+    """
+
+    def __init__(self, chunks, key, close=None):
+        """Куски байтов — из итератора chunks, например iter_content()."""
+        self.chunks = iter(chunks)
+        self.key = key
+        self.close = close
+        self.fields = {}
+        self.document = None
+        self.is_object = True
+        self.consumed = False
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        """Элементы массива key; поток читается один раз."""
+        if self.consumed:
+            raise RuntimeError("Ответ API уже прочитан")
+        self.consumed = True
+        try:
+            yield from self._parse()
+        finally:
+            if self.close is not None:
+                self.close()
+
+    def get(self, key, default=None):
+        """Поле верхнего уровня, как dict.get."""
+        return self.fields.get(key, default)
+
+    def envelope(self):
+        """Ответ без элементов массива — для проверки его формата."""
+        return self.fields if self.is_object else self.document
+
+    def _parse(self):
+        if self._peek() != "{":
+            self.is_object = False
+            self.document = self._value()
+            return
+        self._pos += 1
+        if self._peek() == "}":
+            return
+        while True:
+            name = self._value()
+            self._expect(":")
+            if name == self.key and self._peek() == "[":
+                self._pos += 1
+                self.fields[name] = []
+                yield from self._items()
+            else:
+                self.fields[name] = self._value()
+            if self._delimiter("}"):
+                return
+
+    def _items(self):
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._delimiter("]"):
+                return
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                if self._eof or self._complete(value, end):
+                    self._pos = end
+                    return value
+            if len(self._buffer) - self._pos > MAX_VALUE_SIZE:
+                raise ValueError("Элемент ответа API слишком велик")
+            self._fill()
+
+    def _complete(self, value, end):
+        """Значение не продолжится в следующем куске.
+
+        Число на краю буфера может продолжиться, в том числе когда
+        кусок оборвался на «12.» или «1e»: raw_decode тогда отдаёт
+        целую часть и останавливается перед дробью или порядком.
+        """
+        if end == len(self._buffer):
+            return False
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return not _NUMBER_TAIL.fullmatch(self._buffer, end)
+        return True
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Ожидался {char!r} на позиции {self._pos}")
+        self._pos += 1
+
+    def _delimiter(self, closing):
+        """True на закрывающей скобке, False на запятой."""
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char == ",":
+            return False
+        raise ValueError(f"Ожидались ',' или {closing!r}, получено {char!r}")
+
+    def _peek(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Ответ API оборван")
+
+    def _fill(self):
+        """Дочитывает следующий кусок; False в конце потока."""
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self.chunks:
+            text = self._decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decode(b"", final=True)
+        self._eof = True
+        return False
+
+
+def stream_response(response, key="homeworks", chunk_size=CHUNK_SIZE):
+    """Поток поверх requests.Response, открытого со stream=True."""
+    return ObjectStream(
+        response.iter_content(chunk_size), key, close=response.close
+    )
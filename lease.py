@@ -0,0 +1,203 @@
+import fcntl
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+LEASE_TTL = 30
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseBackend:
+    """Хранилище аренды: опрос ведёт только её владелец.
+
+    Для общего хранилища в продакшене (Redis, Postgres) достаточно
+    реализовать оба метода с атомарной проверкой срока и владельца.
+    """
+
+    def acquire(self, owner, ttl):
+        """Берёт или продлевает аренду на ttl секунд; True при успехе."""
+        raise NotImplementedError
+
+    def release(self, owner):
+        """Отдаёт аренду, если она принадлежит owner."""
+        raise NotImplementedError
+
+
+class NullLease(LeaseBackend):
+    """Без координации: единственный процесс всегда ведущий."""
+
+    def acquire(self, owner, ttl):
+        """Аренда всегда свободна."""
+        return True
+
+    def release(self, owner):
+        """Отдавать нечего."""
+
+
+class FileLease(LeaseBackend):
+    """flock на локальном файле: для нескольких процессов одной машины.
+
+    Блокировку снимает ОС, когда процесс-владелец завершается,
+    поэтому ttl здесь не нужен.
+    """
+
+    def __init__(self, path):
+        """Файл блокировки создаётся при первом захвате."""
+        self.path = path
+        self.fd = None
+
+    def acquire(self, owner, ttl):
+        """Неблокирующая попытка взять flock."""
+        if self.fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, owner.encode())
+        self.fd = fd
+        return True
+
+    def release(self, owner):
+        """Снимает flock."""
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+
+
+class SQLiteLease(LeaseBackend):
+    """Аренда со сроком в таблице SQLite."""
+
+    def __init__(self, path, name="homework"):
+        """Создаёт таблицу аренд, если её нет."""
+        self.path = path
+        self.name = name
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases "
+                "(name TEXT PRIMARY KEY, owner TEXT, expires_at REAL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def acquire(self, owner, ttl):
+        """Берёт аренду, если она свободна, истекла или уже наша."""
+        now = time.time()
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT owner, expires_at FROM leases WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                connection.execute("ROLLBACK")
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO leases VALUES (?, ?, ?)",
+                (self.name, owner, now + ttl),
+            )
+            connection.execute("COMMIT")
+            return True
+        finally:
+            connection.close()
+
+    def release(self, owner):
+        """Удаляет свою аренду, чтобы резерв взял её сразу."""
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM leases WHERE name = ? AND owner = ?",
+                (self.name, owner),
+            )
+
+
+def create_backend(url):
+    """Хранилище по строке LEASE_BACKEND: none, file:путь, sqlite:путь."""
+    kind, _, path = (url or "none").partition(":")
+    if kind == "none":
+        return NullLease()
+    if kind == "file":
+        return FileLease(path)
+    if kind == "sqlite":
+        return SQLiteLease(path)
+    raise ValueError(f"Неизвестное хранилище аренды: {url}")
+
+
+class LeaderElector:
+    """Держит аренду в фоновом потоке и сообщает, ведущий ли процесс."""
+
+    def __init__(self, backend, ttl=LEASE_TTL, owner=None, on_lost=None):
+        """Аренда продлевается каждые ttl / 3 секунд.
+
+        on_lost вызывается из фонового потока, если аренда потеряна.
+        """
+        self.backend = backend
+        self.on_lost = on_lost
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.leader = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def is_leader(self):
+        """True, пока аренда за этим процессом."""
+        return self.leader.is_set()
+
+    def wait_for_leadership(self, shutdown):
+        """Ждёт аренду; False, если раньше пришёл сигнал остановки."""
+        while not shutdown.requested:
+            if self._try_acquire():
+                logger.info(f"{self.owner} стал ведущим")
+                self.leader.set()
+                self.stopped.clear()
+                self.thread = threading.Thread(
+                    target=self._renew, name="lease-renew", daemon=True
+                )
+                self.thread.start()
+                return True
+            shutdown.wait(self.ttl / 3)
+        return False
+
+    def _try_acquire(self):
+        try:
+            return self.backend.acquire(self.owner, self.ttl)
+        except Exception as error:
+            logger.error(f"Хранилище аренды недоступно: {error}")
+            return False
+
+    def _renew(self):
+        """Продлевает аренду; сбой хранилища терпим, пока она не истекла."""
+        renewed = time.monotonic()
+        while not self.stopped.wait(self.ttl / 3):
+            try:
+                if self.backend.acquire(self.owner, self.ttl):
+                    renewed = time.monotonic()
+                    continue
+            except Exception as error:
+                logger.error(f"Аренда не продлена: {error}")
+                if time.monotonic() - renewed < self.ttl:
+                    continue
+            logger.error(f"{self.owner} потерял аренду")
+            self.leader.clear()
+            if self.on_lost is not None:
+                self.on_lost()
+            return
+
+    def release(self):
+        """Останавливает продление и отдаёт аренду."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        if self.leader.is_set():
+            self.leader.clear()
+            self.backend.release(self.owner)
@@ -0,0 +1,134 @@
+import atexit
+import itertools
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+SAMPLED_LOGGERS = ("homework", "__main__", "api_client")
+
+_listeners = set()
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись — одна JSON-строка."""
+
+    def format(self, record):
+        """Сериализует основные поля записи."""
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает каждую rate-ю запись уровня INFO и ниже.
+
+    Счётчик ведётся отдельно для каждого места вызова, так что
+    редкие строки не теряются из-за частых. WARNING и выше проходят всегда.
+    """
+
+    def __init__(self, rate):
+        """rate=1 отключает выборку."""
+        super().__init__()
+        self.rate = rate
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        """True, если запись нужно записать."""
+        if self.rate <= 1 or record.levelno > logging.INFO:
+            return True
+        with self._lock:
+            counter = self.counters.setdefault(
+                (record.pathname, record.lineno), itertools.count()
+            )
+            return next(counter) % self.rate == 0
+
+
+def use_json_format(logger=None):
+    """Переключает обработчики логгера на JsonFormatter."""
+    for handler in (logger or logging.getLogger()).handlers:
+        handler.setFormatter(JsonFormatter())
+
+
+def add_sampling(rate, names=SAMPLED_LOGGERS):
+    """Вешает SamplingFilter на частые логгеры вместо прежнего."""
+    remove_sampling(names)
+    sampler = SamplingFilter(rate)
+    for name in names:
+        logging.getLogger(name).addFilter(sampler)
+    return sampler
+
+
+def remove_sampling(names=SAMPLED_LOGGERS):
+    """Снимает SamplingFilter с логгеров names."""
+    for name in names:
+        logger = logging.getLogger(name)
+        for log_filter in list(logger.filters):
+            if isinstance(log_filter, SamplingFilter):
+                logger.removeFilter(log_filter)
+
+
+def start_queue_logging(logger=None):
+    """Переносит запись логов в отдельный поток через очередь.
+
+    Обработчики логгера переходят к QueueListener, а на их место
+    встаёт QueueHandler, который только кладёт запись в очередь.
+    """
+    logger = logger or logging.getLogger()
+    handlers = [
+        handler for handler in logger.handlers
+        if not isinstance(handler, QueueHandler)
+    ]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    _listeners.add(listener)
+    return listener
+
+
+def stop_listener(listener):
+    """Дописывает очередь и останавливает поток, если он ещё работает."""
+    _listeners.discard(listener)
+    if listener._thread is not None:
+        listener.stop()
+
+
+def stop_listeners():
+    """Останавливает все работающие слушатели; вызывается при выходе."""
+    for listener in list(_listeners):
+        stop_listener(listener)
+
+
+atexit.register(stop_listeners)
+
+
+def configure(log_format="text", sample_rate=1, mode="sync"):
+    """Применяет LOG_FORMAT, LOG_SAMPLE_RATE и LOG_MODE.
+
+    Значения передаёт вызывающий из настроек, поэтому при повторном
+    вызове действуют новые значения из .env. Возвращает QueueListener
+    в режиме async, иначе None.
+    """
+    if log_format == "json":
+        use_json_format()
+    if sample_rate > 1:
+        add_sampling(sample_rate)
+    else:
+        remove_sampling()
+    if mode == "async":
+        return start_queue_logging()
+    return None
@@ -0,0 +1,223 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"),
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = []
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _label_key(labels):
+    """Метки как отсортированные пары строк: значения бывают и числами."""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Базовый класс: метрика с именем попадает в REGISTRY."""
+
+    type = None
+
+    def __init__(self, name=None, documentation=""):
+        """Безымянные метрики не регистрируются и не экспортируются."""
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        if name:
+            REGISTRY.append(self)
+
+    def samples(self):
+        """Пары (имя с метками, значение) для экспорта."""
+        raise NotImplementedError
+
+    def render(self):
+        """Метрика в текстовом формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(
+            f"{name} {_format_value(value)}" for name, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик с необязательными метками."""
+
+    type = "counter"
+
+    def __init__(self, name=None, documentation=""):
+        """Значения хранятся отдельно для каждого набора меток."""
+        super().__init__(name, documentation)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        """Увеличивает счётчик для набора меток."""
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        """Одна строка на каждый набор меток."""
+        for labels, value in sorted(self.values.items()):
+            yield self.name + _format_labels(labels), value
+
+
+class Gauge(Metric):
+    """Текущее значение или функция, вычисляемая при экспорте."""
+
+    type = "gauge"
+
+    def __init__(self, name=None, documentation=""):
+        """Начальное значение — ноль."""
+        super().__init__(name, documentation)
+        self.value = 0
+        self.function = None
+
+    def set(self, value):
+        """Запоминает значение."""
+        self.value = value
+
+    def set_function(self, function):
+        """Значение будет вычисляться вызовом function()."""
+        self.function = function
+
+    def get(self):
+        """Текущее значение."""
+        if self.function is not None:
+            return self.function()
+        return self.value
+
+    def samples(self):
+        """Единственная строка со значением."""
+        yield self.name, self.get()
+
+
+class Histogram(Metric):
+    """Гистограмма с фиксированными границами корзин."""
+
+    type = "histogram"
+
+    def __init__(self, name=None, documentation="", buckets=LATENCY_BUCKETS):
+        """Последняя граница должна быть бесконечностью."""
+        super().__init__(name, documentation)
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+        self.label_pairs = ()
+        self.children = {}
+
+    def labels(self, **labels):
+        """Дочерняя гистограмма для набора меток, экспортируется с ней."""
+        key = _label_key(labels)
+        with self._lock:
+            child = self.children.get(key)
+            if child is None:
+                child = Histogram(buckets=self.buckets)
+                child.name = self.name
+                child.label_pairs = key
+                self.children[key] = child
+        return child
+
+    def observe(self, value):
+        """Добавляет одно наблюдение."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Замеряет длительность блока with, в том числе с исключением."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def percentile(self, q):
+        """Верхняя граница корзины, в которую попадает q-квантиль."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def samples(self):
+        """Накопительные корзины, сумма и количество; затем дочерние."""
+        if self.count or not self.children:
+            total = 0
+            for bound, count in zip(self.buckets, self.counts):
+                total += count
+                labels = _format_labels(
+                    self.label_pairs + (("le", _format_value(bound)),)
+                )
+                yield f"{self.name}_bucket{labels}", total
+            labels = _format_labels(self.label_pairs)
+            yield f"{self.name}_sum{labels}", self.sum
+            yield f"{self.name}_count{labels}", self.count
+        for _, child in sorted(self.children.items()):
+            yield from child.samples()
+
+
+def render():
+    """Все зарегистрированные метрики в текстовом формате Prometheus."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт /metrics, на остальные пути отвечает 404."""
+
+    def do_GET(self):
+        """Ответ на GET /metrics."""
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Запросы Prometheus не пишутся в лог."""
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Запускает эндпоинт /metrics в фоновом потоке."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics", daemon=True
+    )
+    thread.start()
+    logger.info(f"Метрики доступны на http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+COMPACT_AFTER = 1000
+DONE_KEYS = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """Журнал исходящих сообщений в JSONL-файле, только на дозапись.
+
+    Сообщение записывается до отправки и помечается done после неё,
+    поэтому после падения бота или недоступности Телеграма неотправленные
+    сообщения можно дослать: доставка «хотя бы один раз». Повторы идут
+    с тем же ключом идемпотентности, так что уже отправленное и уже
+    стоящее в очереди второй раз не отправляется.
+    """
+
+    def __init__(self, path):
+        """Восстанавливает неотправленные сообщения из журнала."""
+        self.path = path
+        self.entries = OrderedDict()
+        self.done = OrderedDict()
+        self.records = 0
+        self._lock = threading.Lock()
+        self._load()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        try:
+            file = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.error(f"Пропущена битая строка журнала {self.path}")
+                    continue
+                if record["op"] == "add":
+                    self.entries[record["key"]] = record
+                else:
+                    self.entries.pop(record["key"], None)
+                    self._remember_done(record["key"])
+                self.records += 1
+
+    def _remember_done(self, key):
+        self.done[key] = True
+        if len(self.done) > DONE_KEYS:
+            self.done.popitem(last=False)
+
+    def _append(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.records += 1
+
+    def add(self, chat_id, text, key=None):
+        """Записывает сообщение; None, если ключ уже есть или отправлен.
+
+        Повтор отсеивается только по постоянному ключу, например
+        «чат:работа:статус»; без key сообщение получает случайный ключ.
+        """
+        key = key or uuid.uuid4().hex
+        with self._lock:
+            if key in self.entries or key in self.done:
+                return None
+            record = {
+                "op": "add", "key": key, "chat_id": chat_id,
+                "text": text, "time": time.time(),
+            }
+            self._append(record)
+            self.entries[key] = record
+        return key
+
+    def mark_done(self, keys, op="done"):
+        """Отмечает сообщения доставленными.
+
+        op="rejected" — Телеграм отверг сообщение навсегда: оно тоже
+        больше не повторяется, но в журнале видно, что не доставлено.
+        """
+        with self._lock:
+            for key in keys:
+                if self.entries.pop(key, None) is None:
+                    continue
+                self._append({"op": op, "key": key})
+                self._remember_done(key)
+            garbage = self.records - len(self.done) - len(self.entries)
+            if garbage > COMPACT_AFTER:
+                self._compact()
+
+    def is_done(self, key):
+        """Сообщение с ключом key уже доставлено."""
+        with self._lock:
+            return key in self.done
+
+    def pending(self):
+        """Неотправленные сообщения в порядке записи."""
+        with self._lock:
+            return list(self.entries.values())
+
+    def _compact(self):
+        """Переписывает журнал: остаются неотправленные и недавние ключи."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            for key in self.done:
+                file.write(json.dumps({"op": "done", "key": key}) + "\n")
+            for record in self.entries.values():
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self.file.close()
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.records = len(self.done) + len(self.entries)
+
+    def close(self):
+        """Закрывает файл журнала."""
+        with self._lock:
+            self.file.close()
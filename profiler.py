@@ -0,0 +1,144 @@
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import signal
+import time
+import tracemalloc
+from collections import defaultdict
+
+PROFILE_CYCLES = 10
+TRACEMALLOC_FRAMES = 10
+
+logger = logging.getLogger(__name__)
+
+_IDLE = contextlib.nullcontext()
+
+
+class _Stage:
+    """Замер этапа цикла без времени вложенных этапов."""
+
+    __slots__ = ("profiler", "name", "started", "children")
+
+    def __init__(self, profiler, name):
+        """Этап привязан к текущему захвату профилировщика."""
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        """Начало этапа."""
+        self.children = 0.0
+        self.profiler.stack.append(self)
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        """Конец этапа: собственное время уходит в сводку."""
+        elapsed = time.perf_counter() - self.started
+        stack = self.profiler.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        self.profiler.stages[self.name].append(elapsed - self.children)
+
+
+class Profiler:
+    """Профилирование нескольких циклов опроса по запросу.
+
+    Захват включается сигналом SIGUSR1 или request() и длится cycles
+    циклов: cProfile главного потока, снимок tracemalloc и время
+    этапов fetch, parse, validate, render, send. Результат пишется в
+    directory. Пока захват выключен, cycle() и stage() возвращают
+    общий пустой контекст и почти ничего не стоят.
+    """
+
+    def __init__(self, directory, cycles=PROFILE_CYCLES):
+        """Файлы профилей пишутся в directory, каталог создаётся сам."""
+        self.directory = directory
+        self.cycles = cycles
+        self.requested = False
+        self.remaining = 0
+        self.profile = None
+        self.started_tracemalloc = False
+        self.stages = None
+        self.stack = []
+
+    def install_signal_handler(self, signum=signal.SIGUSR1):
+        """Захват по kill -USR1."""
+        signal.signal(signum, self._on_signal)
+
+    def _on_signal(self, signum, frame):
+        self.requested = True
+
+    def request(self, cycles=None):
+        """Запрашивает захват со следующего цикла."""
+        if cycles is not None:
+            self.cycles = cycles
+        self.requested = True
+
+    @property
+    def active(self):
+        """True, пока идёт захват."""
+        return self.stages is not None
+
+    def stage(self, name):
+        """Контекст замера этапа цикла."""
+        if self.stages is None:
+            return _IDLE
+        return _Stage(self, name)
+
+    @contextlib.contextmanager
+    def _capture_cycle(self):
+        if self.stages is None:
+            self._start()
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self._finish()
+
+    def cycle(self):
+        """Контекст одного цикла опроса."""
+        if self.stages is None and not self.requested:
+            return _IDLE
+        return self._capture_cycle()
+
+    def _start(self):
+        self.requested = False
+        self.remaining = self.cycles
+        self.profile = cProfile.Profile()
+        self.started_tracemalloc = not tracemalloc.is_tracing()
+        if self.started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.stages = defaultdict(list)
+        logger.info(f"Профилирование {self.cycles} циклов")
+
+    def _finish(self):
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(
+            self.directory, time.strftime("%Y%m%d-%H%M%S")
+        )
+        self.profile.dump_stats(f"{prefix}.pstats")
+        tracemalloc.take_snapshot().dump(f"{prefix}.tracemalloc")
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+        summary = self.summary()
+        with open(f"{prefix}.stages.json", "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        logger.info(f"Профиль записан в {prefix}.*: {summary}")
+        self.profile = None
+        self.stages = None
+
+    def summary(self):
+        """Число, сумма и максимум времени каждого этапа в мс."""
+        return {
+            name: {
+                "count": len(durations),
+                "total_ms": round(sum(durations) * 1000, 3),
+                "max_ms": round(max(durations) * 1000, 3),
+            }
+            for name, durations in (self.stages or {}).items()
+        }
@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+
+SCRUBBED = "***"
+
+
+def scrub(value, secrets):
+    """Копия значения, в строках которой секреты заменены на ***."""
+    if isinstance(value, str):
+        for secret in secrets:
+            value = value.replace(secret, SCRUBBED)
+        return value
+    if isinstance(value, dict):
+        return {key: scrub(item, secrets) for key, item in value.items()}
+    if isinstance(value, list):
+        return [scrub(item, secrets) for item in value]
+    return value
+
+
+class Recorder:
+    """Пишет ответы API и отправки в Телеграм в JSONL для повтора.
+
+    Каждая строка — событие с полем t, секундами от начала записи:
+    {"type": "api", "from_date", "response"} или {"type": "api",
+    "error", "message"} и {"type": "telegram", "chat_id", "text"},
+    у отправки с ключом идемпотентности ещё и "key". Токены из secrets
+    в файл не попадают.
+    """
+
+    def __init__(self, path, secrets=()):
+        """Файл открывается на дозапись."""
+        self.path = path
+        self.secrets = [secret for secret in secrets if secret]
+        self.file = open(path, "a", encoding="utf-8")
+        self.started = time.monotonic()
+        self.originals = {}
+        self.module = None
+        self._lock = threading.Lock()
+
+    def write(self, event):
+        """Дописывает событие с отметкой времени."""
+        event = scrub(event, self.secrets)
+        event["t"] = round(time.monotonic() - self.started, 3)
+        with self._lock:
+            self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+    def install(self, module):
+        """Оборачивает get_api_answer и send_message_to модуля бота.
+
+        Потоковый stream_api_answer на время записи заменяется обычным
+        запросом: записать можно только ответ целиком.
+        """
+        get_api_answer = module.get_api_answer
+        send_message_to = module.send_message_to
+
+        def recorded_get_api_answer(current_timestamp):
+            try:
+                response = get_api_answer(current_timestamp)
+            except Exception as error:
+                self.write({
+                    "type": "api", "from_date": current_timestamp,
+                    "error": type(error).__name__, "message": str(error),
+                })
+                raise
+            self.write({
+                "type": "api", "from_date": current_timestamp,
+                "response": response,
+            })
+            return response
+
+        def recorded_send_message_to(bot, chat_id, message, key=None):
+            event = {"type": "telegram", "chat_id": chat_id, "text": message}
+            if key is not None:
+                event["key"] = key
+            self.write(event)
+            return send_message_to(bot, chat_id, message, key=key)
+
+        self.module = module
+        self.originals = {
+            "get_api_answer": get_api_answer,
+            "stream_api_answer": module.stream_api_answer,
+            "send_message_to": send_message_to,
+        }
+        module.get_api_answer = recorded_get_api_answer
+        module.stream_api_answer = recorded_get_api_answer
+        module.send_message_to = recorded_send_message_to
+        return self
+
+    def close(self):
+        """Возвращает исходные функции и закрывает файл."""
+        if self.module is not None:
+            for name, function in self.originals.items():
+                setattr(self.module, name, function)
+            self.module = None
+        with self._lock:
+            self.file.close()
+
+
+def load_events(path):
+    """События записанной сессии в порядке записи."""
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
@@ -0,0 +1,65 @@
+import random
+import time
+
+from requests import RequestException
+
+BASE_INTERVAL = 60
+REVIEWING_INTERVAL = 30
+IDLE_INTERVAL = 5 * 60
+IDLE_AFTER = 3 * 60 * 60
+MAX_BACKOFF = 30 * 60
+JITTER = 0.1
+
+
+def startup_delay(interval=BASE_INTERVAL):
+    """Случайная задержка старта, чтобы опросы не шли залпом."""
+    return random.uniform(0, interval)
+
+
+class PollScheduler:
+    """Выбирает паузу до следующего опроса по состоянию работ."""
+
+    def __init__(self, base_interval=BASE_INTERVAL,
+                 reviewing_interval=REVIEWING_INTERVAL,
+                 idle_interval=IDLE_INTERVAL, idle_after=IDLE_AFTER,
+                 max_backoff=MAX_BACKOFF, clock=time.monotonic):
+        """Интервалы в секундах для обычного, активного и тихого режима."""
+        self.base_interval = base_interval
+        self.reviewing_interval = reviewing_interval
+        self.idle_interval = idle_interval
+        self.idle_after = idle_after
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.last_change = clock()
+        self.reviewing = False
+        self.failures = 0
+
+    def record_success(self, changed, reviewing):
+        """Учитывает успешный опрос: были ли изменения и идёт ли ревью."""
+        self.failures = 0
+        self.reviewing = reviewing
+        if changed:
+            self.last_change = self.clock()
+
+    def record_failure(self, error):
+        """Сетевые и HTTP-ошибки включают экспоненциальную паузу."""
+        if isinstance(error, RequestException):
+            self.failures += 1
+
+    def interval(self):
+        """Пауза без случайной добавки."""
+        if self.failures:
+            backoff = self.base_interval * 2 ** self.failures
+            return min(backoff, self.max_backoff)
+        if self.reviewing:
+            return self.reviewing_interval
+        if self.clock() - self.last_change >= self.idle_after:
+            return self.idle_interval
+        return self.base_interval
+
+    def next_delay(self):
+        """Пауза до следующего опроса со случайным разбросом."""
+        interval = self.interval()
+        if self.failures:
+            return random.uniform(self.base_interval, interval)
+        return interval * random.uniform(1 - JITTER, 1 + JITTER)
@@ -0,0 +1,45 @@
+import logging
+import signal
+import threading
+
+from clocks import SYSTEM_CLOCK
+
+DRAIN_TIMEOUT = 5
+
+logger = logging.getLogger(__name__)
+
+
+class Shutdown:
+    """Флаг остановки, выставляемый SIGTERM и SIGINT.
+
+    Паузы между циклами ждут этот флаг вместо time.sleep, поэтому
+    сигнал прерывает ожидание сразу, а не через RETRY_TIME.
+    """
+
+    def __init__(self, clock=SYSTEM_CLOCK):
+        """Флаг создаётся сброшенным; паузы идут по часам clock."""
+        self.event = threading.Event()
+        self.clock = clock
+
+    def install(self, signals=(signal.SIGTERM, signal.SIGINT)):
+        """Вешает обработчики сигналов; вызывать из главного потока."""
+        for signum in signals:
+            signal.signal(signum, self._on_signal)
+        return self
+
+    def _on_signal(self, signum, frame):
+        logger.info(f"Получен сигнал {signal.Signals(signum).name}")
+        self.event.set()
+
+    @property
+    def requested(self):
+        """True после сигнала остановки."""
+        return self.event.is_set()
+
+    def request(self):
+        """Запрашивает остановку без сигнала."""
+        self.event.set()
+
+    def wait(self, timeout):
+        """Пауза, прерываемая остановкой; True, если пора выходить."""
+        return self.clock.wait(self.event, timeout)
@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+HISTORY_SIZE = 50
+
+
+class StatusCache:
+    """Последние проверенные статусы работ для ответов на команды.
+
+    Обновляется циклом опроса, читается обработчиками команд из потока
+    Телеграма, поэтому все обращения идут под блокировкой.
+    """
+
+    def __init__(self, latest=(), history=(), checked_at=None,
+                 size=HISTORY_SIZE, clock=time.time):
+        """Принимает сохранённые записи из checkpoint."""
+        self.clock = clock
+        self.latest = OrderedDict((entry["key"], entry) for entry in latest)
+        self.history = deque(history, maxlen=size)
+        self.checked_at = checked_at
+        self._lock = threading.Lock()
+
+    @classmethod
+    def restore(cls, state, **kwargs):
+        """Кэш из snapshot(); None — пустой кэш."""
+        return cls(**(state or {}), **kwargs)
+
+    def record(self, homework):
+        """Запоминает новый статус работы validator.Homework."""
+        entry = {
+            "key": homework.key, "name": homework.name,
+            "status": homework.status, "verdict": homework.verdict,
+            "time": self.clock(),
+        }
+        with self._lock:
+            self.latest.pop(homework.key, None)
+            self.latest[homework.key] = entry
+            self.history.append(entry)
+
+    def touch(self):
+        """Отмечает удачный опрос API."""
+        self.checked_at = self.clock()
+
+    def statuses(self):
+        """Текущие статусы, последние изменения первыми."""
+        with self._lock:
+            return list(reversed(self.latest.values()))
+
+    def recent(self, limit):
+        """Последние limit смен статуса, новые первыми."""
+        with self._lock:
+            return list(reversed(self.history))[:limit]
+
+    def snapshot(self):
+        """Состояние для записи в checkpoint."""
+        with self._lock:
+            return {
+                "latest": list(self.latest.values()),
+                "history": list(self.history),
+                "checked_at": self.checked_at,
+            }
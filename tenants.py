@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from telegram import Bot
+from telegram.utils.request import Request
+
+import api_client
+import homework
+from exceptions import TokenError
+
+MAX_PARALLEL_POLLS = int(os.getenv("MAX_PARALLEL_POLLS", 20))
+TENANTS_FILE = os.getenv("TENANTS_FILE", "tenants.json")
+
+logger = logging.getLogger(__name__)
+
+
+class Tenant:
+    """Пара токен Практикума / чат Телеграма со своей меткой времени."""
+
+    def __init__(self, name, practicum_token, chat_id,
+                 current_timestamp=homework.BEGINNING_TIME):
+        """Запоминает токен, чат и момент последнего опроса."""
+        self.name = name
+        self.practicum_token = practicum_token
+        self.chat_id = chat_id
+        self.current_timestamp = current_timestamp
+        self.headers = {"Authorization": f"OAuth {practicum_token}"}
+
+    def __repr__(self):
+        """Не показывает токен в логах."""
+        return f"Tenant({self.name!r}, chat_id={self.chat_id!r})"
+
+
+def load_tenants(path):
+    """Читает реестр из JSON-файла или базы SQLite."""
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute(
+                "SELECT name, practicum_token, telegram_chat_id FROM tenants"
+            ).fetchall()
+        return [Tenant(*row) for row in rows]
+    with open(path, encoding="utf-8") as file:
+        records = json.load(file)
+    return [
+        Tenant(
+            record.get("name", record["telegram_chat_id"]),
+            record["practicum_token"],
+            record["telegram_chat_id"],
+        )
+        for record in records
+    ]
+
+
+def poll_tenant(bot, tenant):
+    """Один цикл опроса для одного пользователя."""
+    try:
+        response = homework.fetch_api_answer(
+            tenant.current_timestamp, tenant.headers
+        )
+        homeworks = homework.check_response(response)
+        if homeworks:
+            result = homework.parse_status(homeworks[0])
+            homework.send_message_to(bot, tenant.chat_id, result)
+        tenant.current_timestamp = response.get("current_date")
+    except Exception as error:
+        message = homework.error_message(error)
+        logger.error(f"{tenant!r}: {message}")
+        try:
+            homework.send_message_to(bot, tenant.chat_id, message)
+        except Exception as send_error:
+            logger.error(f"{tenant!r}: сообщение не отправлено {send_error}")
+
+
+class TenantScheduler:
+    """Опрашивает всех пользователей пулом потоков ограниченного размера."""
+
+    def __init__(self, bot, tenants, max_workers=MAX_PARALLEL_POLLS):
+        """Создаёт пул потоков на max_workers одновременных опросов."""
+        self.bot = bot
+        self.tenants = tenants
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="poller"
+        )
+
+    def run_cycle(self):
+        """Опрашивает всех пользователей и ждёт окончания цикла."""
+        futures = [
+            self.executor.submit(poll_tenant, self.bot, tenant)
+            for tenant in self.tenants
+        ]
+        for future in futures:
+            future.result()
+
+    def run_forever(self, retry_time=None):
+        """Повторяет циклы опроса с паузой retry_time."""
+        retry_time = retry_time or homework.RETRY_TIME
+        while True:
+            started = time.monotonic()
+            self.run_cycle()
+            elapsed = time.monotonic() - started
+            logger.debug(
+                f"Цикл по {len(self.tenants)} пользователям: {elapsed:.2f} s"
+            )
+            time.sleep(max(retry_time - elapsed, 0))
+
+    def shutdown(self):
+        """Останавливает пул потоков."""
+        self.executor.shutdown(wait=True)
+
+
+def main():
+    """Запуск опроса всех пользователей из реестра."""
+    homework.load_config()
+    homework.setup_logging()
+    if not homework.TELEGRAM_TOKEN:
+        logger.error(TokenError)
+        raise TokenError()
+    path = sys.argv[1] if len(sys.argv) > 1 else TENANTS_FILE
+    tenants = load_tenants(path)
+    logger.info(f"Загружено пользователей: {len(tenants)}")
+
+    bot = Bot(
+        token=homework.TELEGRAM_TOKEN,
+        request=Request(con_pool_size=MAX_PARALLEL_POLLS),
+    )
+    client = api_client.PracticumClient(
+        connect_timeout=homework.API_CONNECT_TIMEOUT,
+        read_timeout=homework.API_READ_TIMEOUT,
+        pool_maxsize=MAX_PARALLEL_POLLS,
+    )
+    api_client.use_client(client)
+    scheduler = TenantScheduler(bot, tenants)
+    try:
+        scheduler.run_forever()
+    finally:
+        scheduler.shutdown()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
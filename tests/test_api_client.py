@@ -0,0 +1,101 @@
+import time
+
+import requests
+
+import api_client
+
+
+class TestPracticumClient:
+
+    def test_session_is_reused(self, monkeypatch):
+        client = api_client.PracticumClient()
+        session = client.session
+        calls = []
+
+        def mock_get(url, **kwargs):
+            calls.append(kwargs)
+            return 'response'
+
+        monkeypatch.setattr(session, 'get', mock_get)
+        client.get('https://example.com')
+        client.get('https://example.com')
+
+        assert client.session is session, (
+            'Проверьте, что клиент переиспользует одну сессию'
+        )
+        assert calls[0]['timeout'] == client.timeout, (
+            'Проверьте, что клиент передаёт таймауты по умолчанию'
+        )
+        assert client.stats()['requests'] == 2
+        assert len(client.timings) == 2
+
+    def test_reconnect_on_stale_connection(self, monkeypatch):
+        client = api_client.PracticumClient()
+        stale = client.session
+
+        def broken_get(url, **kwargs):
+            raise requests.ConnectionError('connection reset')
+
+        monkeypatch.setattr(stale, 'get', broken_get)
+        monkeypatch.setattr(
+            requests.Session, 'get', lambda self, url, **kwargs: 'fresh'
+        )
+
+        assert client.get('https://example.com') == 'fresh'
+        assert client.session is not stale, (
+            'Проверьте, что после обрыва соединения сессия пересоздаётся'
+        )
+        assert client.reconnects == 1
+
+    def test_timeout_is_not_retried(self, monkeypatch):
+        client = api_client.PracticumClient()
+
+        def slow_get(url, **kwargs):
+            raise requests.ConnectTimeout('timeout')
+
+        monkeypatch.setattr(client.session, 'get', slow_get)
+        try:
+            client.get('https://example.com')
+        except requests.ConnectTimeout:
+            pass
+        else:
+            assert False, 'Таймаут не должен подавляться клиентом'
+        assert client.reconnects == 0
+
+    def test_slow_request_is_hedged(self, monkeypatch):
+        client = api_client.PracticumClient(hedging=True)
+        for _ in range(api_client.HEDGE_MIN_SAMPLES):
+            client.latency.observe(0.01)
+        assert client.hedge_delay() == 0.01
+        calls = []
+
+        class Response:
+
+            def __init__(self, name):
+                self.name = name
+                self.closed = False
+
+            def close(self):
+                self.closed = True
+
+        def mock_get(url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.2)
+                return Response('slow')
+            return Response('fast')
+
+        monkeypatch.setattr(client.session, 'get', mock_get)
+        response = client.get('https://example.com')
+        client.close()
+
+        assert response.name == 'fast', (
+            'Проверьте, что используется первый пришедший ответ'
+        )
+        assert client.hedges == 1
+        assert len(calls) == 2
+
+    def test_no_hedging_without_samples(self):
+        client = api_client.PracticumClient(hedging=True)
+        assert client.hedge_delay() is None
+        client.close()
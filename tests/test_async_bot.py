@@ -0,0 +1,64 @@
+import asyncio
+
+from aiohttp import web
+
+import async_bot
+import tenants
+
+
+async def run_cycle(monkeypatch, homeworks, status=200):
+    sent = []
+
+    async def statuses(request):
+        if status != 200:
+            return web.Response(status=status)
+        return web.json_response(
+            {'homeworks': homeworks, 'current_date': 777}
+        )
+
+    async def send(request):
+        sent.append(await request.json())
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/statuses/', statuses)
+    app.router.add_post('/bot{token}/sendMessage', send)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    base = f'http://127.0.0.1:{port}'
+    monkeypatch.setattr(async_bot.homework, 'ENDPOINT', f'{base}/statuses/')
+    monkeypatch.setattr(
+        async_bot, 'TELEGRAM_API_URL', base + '/bot{token}/sendMessage'
+    )
+
+    tenant = tenants.Tenant('t', 'token', 42)
+    try:
+        async with async_bot.create_session() as session:
+            await async_bot.poll_once(session, tenant)
+    finally:
+        await runner.cleanup()
+    return tenant, sent
+
+
+class TestAsyncBot:
+
+    def test_status_change_is_sent(self, monkeypatch):
+        tenant, sent = asyncio.run(run_cycle(
+            monkeypatch, [{'homework_name': 'hw', 'status': 'approved'}]
+        ))
+        assert tenant.current_timestamp == 777
+        assert len(sent) == 1
+        assert sent[0]['chat_id'] == 42
+        assert sent[0]['text'].startswith(
+            'Изменился статус проверки работы "hw"'
+        )
+
+    def test_api_error_is_reported(self, monkeypatch):
+        tenant, sent = asyncio.run(run_cycle(monkeypatch, [], status=500))
+        assert tenant.current_timestamp == tenants.homework.BEGINNING_TIME
+        assert sent[0]['text'].startswith('API Практикума недоступна'), (
+            'Проверьте, что ошибки HTTP обрабатываются как в main()'
+        )
@@ -0,0 +1,78 @@
+import random
+import subprocess
+import sys
+
+from benchmarks import bench_cycle, bench_import, bench_replay, simulate
+
+
+class TestBenchmark:
+
+    def test_benchmark_runs_on_stubs(self, tmp_path):
+        result = bench_cycle.run_benchmark(cycles=5, homeworks=3)
+        assert result['errors'] == 0, (
+            'Цикл на локальных заглушках должен проходить без ошибок'
+        )
+        assert result['throughput'] > 0
+        assert result['p50_ms'] <= result['p99_ms']
+
+        path = str(tmp_path / 'results.jsonl')
+        bench_cycle.save_result(path, result)
+        assert bench_cycle.previous_result(path, result['params']) == result
+
+    def test_parse_importtime(self):
+        stderr = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        100 | site\n'
+            'import time:       300 |        300 |   requests\n'
+            'import time:        50 |        50 |     certifi\n'
+            'import time:       200 |        550 | homework\n'
+        )
+        timings = bench_import.parse_importtime(stderr, 'homework')
+        assert timings == {
+            'homework': 0.00055, 'requests': 0.0003, 'certifi': 0.00005
+        }
+
+    def test_homework_import_is_lazy(self):
+        code = (
+            'import sys, logging, homework; '
+            'assert "telegram" not in sys.modules; '
+            'assert not logging.getLogger().handlers'
+        )
+        subprocess.run(
+            [sys.executable, '-c', code], cwd=bench_import.ROOT_DIR,
+            check=True,
+        )
+
+    def test_replay_recorded_session(self):
+        homeworks = [{'id': 1, 'homework_name': 'hw1', 'status': 'approved'}]
+        events = [
+            {'type': 'api', 't': 0.0,
+             'response': {'homeworks': [], 'current_date': 1}},
+            {'type': 'api', 't': 60.0, 'error': 'HTTPError',
+             'message': '500 Server Error'},
+            {'type': 'api', 't': 120.0,
+             'response': {'homeworks': homeworks, 'current_date': 2}},
+            {'type': 'telegram', 't': 120.1, 'chat_id': 1, 'text': 'hw1'},
+        ]
+        result = bench_replay.replay(events)
+        assert result['polls'] == 3
+        assert result['errors'] == 1
+        assert result['recorded_messages'] == 1
+        assert result['messages'] == 3, (
+            'Ожидаются ошибка, восстановление и смена статуса'
+        )
+
+    def test_timeline_ends_with_simulation(self):
+        timeline = simulate.make_timeline(50, 1, random.Random(0))
+        assert timeline
+        assert all(offset < simulate.DAY for offset, _, _ in timeline), (
+            'Смены статуса после конца симуляции считались бы пропущенными'
+        )
+
+    def test_simulated_days_of_polling(self):
+        result = simulate.simulate(days=2, homeworks=5, outages=2)
+        assert result['requests_per_day'] > 24 * 60 * 60 / 600, (
+            'Бот должен опрашивать API не реже раза в 10 минут'
+        )
+        assert result['notified'] + result['missed'] > 0
+        assert result['wall_seconds'] < 30
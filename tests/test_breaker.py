@@ -0,0 +1,153 @@
+import json
+
+from requests import HTTPError
+
+import homework
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from clocks import VirtualClock
+from error_notifier import RECOVERED_MESSAGE
+from exceptions import CircuitOpenError
+from json_stream import ObjectStream
+from utils import MemoryCheckpoint, MockBot
+
+
+class FlakyApi:
+
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+
+    def __call__(self, timestamp):
+        self.calls += 1
+        if self.failing:
+            raise HTTPError('500')
+        return {'homeworks': [], 'current_date': timestamp}
+
+
+class StreamingApi(FlakyApi):
+
+    def __call__(self, timestamp):
+        document = super().__call__(timestamp)
+        document['homeworks'] = [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing'}
+        ]
+        return ObjectStream([json.dumps(document).encode()], 'homeworks')
+
+
+class TestCircuitBreaker:
+
+    def test_open_circuit_serves_cache(self):
+        clock = VirtualClock()
+        breaker = CircuitBreaker(
+            failure_threshold=2, recovery_time=60, clock=clock.monotonic
+        )
+        api = FlakyApi()
+        assert breaker.call(api, 1)['current_date'] == 1
+
+        api.failing = True
+        for _ in range(2):
+            try:
+                breaker.call(api, 2)
+            except HTTPError:
+                pass
+        assert breaker.state == OPEN
+        calls = api.calls
+        assert breaker.call(api, 3) == {'homeworks': [], 'current_date': 1}, (
+            'Проверьте, что при разомкнутой цепи отдаётся последний ответ'
+        )
+        assert api.calls == calls, 'API не должно вызываться при OPEN'
+
+        clock.advance(60)
+        api.failing = False
+        assert breaker.call(api, 4)['current_date'] == 4
+        assert breaker.state == CLOSED
+        assert breaker.transitions[(OPEN, HALF_OPEN)] == 1
+        assert breaker.transitions[(HALF_OPEN, CLOSED)] == 1
+
+    def test_failed_trial_reopens(self):
+        clock = VirtualClock()
+        breaker = CircuitBreaker(
+            failure_threshold=1, recovery_time=60, clock=clock.monotonic
+        )
+        api = FlakyApi()
+        api.failing = True
+        for _ in range(2):
+            clock.advance(60)
+            try:
+                breaker.call(api, 1)
+            except HTTPError:
+                pass
+        assert breaker.state == OPEN
+        assert breaker.transitions[(HALF_OPEN, OPEN)] == 1
+
+    def test_open_without_cache_raises(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        api = FlakyApi()
+        api.failing = True
+        try:
+            breaker.call(api, 1)
+        except HTTPError:
+            pass
+        try:
+            breaker.call(api, 1)
+        except CircuitOpenError:
+            pass
+        else:
+            assert False, 'Без кэша должна быть ошибка CircuitOpenError'
+
+    def test_cached_answer_is_not_recovery(self):
+        clock = VirtualClock()
+        api = FlakyApi()
+        bot = MockBot()
+        poller = homework.Poller(
+            bot, MemoryCheckpoint(), clock=clock, fetch=api
+        )
+        poller.poll()
+        last_success = poller.last_success
+        checked_at = poller.cache.checked_at
+
+        api.failing = True
+        threshold = poller.breaker.failure_threshold
+        for _ in range(threshold + 3):
+            clock.advance(10)
+            poller.poll()
+        assert poller.breaker.state == OPEN
+        assert poller.breaker.served_from_cache
+        assert RECOVERED_MESSAGE not in bot.texts, (
+            'Ответ из кэша не означает, что API снова доступно'
+        )
+        assert poller.scheduler.failures == threshold
+        assert poller.last_success == last_success
+        assert poller.cache.checked_at == checked_at
+
+        api.failing = False
+        clock.advance(poller.breaker.recovery_time)
+        poller.poll()
+        assert poller.breaker.state == CLOSED
+        assert bot.texts.count(RECOVERED_MESSAGE) == 1
+        assert poller.scheduler.failures == 0
+
+    def test_stream_is_not_replayed_from_cache(self):
+        clock = VirtualClock()
+        api = StreamingApi()
+        bot = MockBot()
+        poller = homework.Poller(
+            bot, MemoryCheckpoint(), clock=clock, fetch=api
+        )
+        poller.poll()
+        assert len(bot.sent) == 1
+        assert not isinstance(poller.breaker.cached, ObjectStream), (
+            'Одноразовый поток нельзя отдавать из кэша повторно'
+        )
+
+        api.failing = True
+        for _ in range(poller.breaker.failure_threshold + 3):
+            clock.advance(10)
+            poller.poll()
+        assert poller.breaker.state == OPEN
+        assert poller.breaker.served_from_cache
+        assert len(bot.texts) == 2, bot.texts
+        assert 'уже прочитан' not in bot.texts[1]
+        assert poller.current_timestamp == poller.breaker.cached[
+            'current_date'
+        ]
@@ -0,0 +1,24 @@
+from checkpoint import CheckpointStore
+
+
+class TestCheckpointStore:
+
+    def test_state_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'checkpoint.json')
+        store = CheckpointStore(path)
+        assert store.get('current_date', 1) == 1
+        store.update(current_date=1000198000)
+
+        restarted = CheckpointStore(path)
+        assert restarted.get('current_date') == 1000198000, (
+            'Проверьте, что метка времени читается после перезапуска'
+        )
+        assert [p.name for p in tmp_path.iterdir()] == ['checkpoint.json'], (
+            'Временный файл должен заменять основной, а не оставаться рядом'
+        )
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        path = tmp_path / 'checkpoint.json'
+        path.write_text('{not json')
+        store = CheckpointStore(str(path))
+        assert store.get('current_date') is None
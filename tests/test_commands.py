@@ -0,0 +1,57 @@
+import homework
+from commands import history_limit, history_reply, status_reply
+from status_cache import StatusCache
+from utils import MemoryCheckpoint, MockBot
+from validator import Homework
+
+
+class TestStatusCommands:
+
+    def test_cache_keeps_latest_status_and_history(self):
+        cache = StatusCache(clock=lambda: 0)
+        cache.record(Homework(1, 'hw1', 'reviewing', 'На проверке.'))
+        cache.record(Homework(2, 'hw2', 'reviewing', 'На проверке.'))
+        cache.record(Homework(1, 'hw1', 'approved', 'Ура!'))
+
+        assert [e['name'] for e in cache.statuses()] == ['hw1', 'hw2']
+        assert cache.statuses()[0]['verdict'] == 'Ура!'
+        assert [e['status'] for e in cache.recent(2)] == [
+            'approved', 'reviewing'
+        ]
+        restored = StatusCache.restore(cache.snapshot())
+        assert restored.statuses() == cache.statuses()
+        assert restored.recent(10) == cache.recent(10)
+
+    def test_replies(self):
+        cache = StatusCache()
+        assert 'пока нет' in status_reply(cache)
+        assert 'пуста' in history_reply(cache)
+        cache.record(Homework(1, 'hw1', 'approved', 'Ура!'))
+        cache.touch()
+        assert status_reply(cache).startswith('"hw1": Ура!')
+        assert history_reply(cache).endswith('"hw1": approved')
+
+    def test_history_limit_argument(self):
+        assert history_limit([]) == 10
+        assert history_limit(['3']) == 3
+        assert history_limit(['abc']) == 10
+        assert history_limit(['1000']) == 50
+
+    def test_poll_loop_updates_cache(self):
+        response = {
+            'homeworks': [{'id': 7, 'homework_name': 'hw7',
+                           'status': 'approved'}],
+            'current_date': 100,
+        }
+        checkpoint = MemoryCheckpoint()
+        poller = homework.Poller(
+            MockBot(), checkpoint, fetch=lambda timestamp: response
+        )
+        poller.poll()
+        assert [e['key'] for e in poller.cache.statuses()] == ['7']
+        assert poller.cache.checked_at is not None
+
+        restarted = homework.Poller(MockBot(), checkpoint)
+        assert restarted.cache.statuses() == poller.cache.statuses(), (
+            'Кэш статусов должен переживать перезапуск бота'
+        )
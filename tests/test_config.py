@@ -0,0 +1,136 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import config
+
+
+class TestConfig:
+
+    def test_env_file_is_layered_under_process_env(self, tmp_path,
+                                                   monkeypatch):
+        env_file = tmp_path / '.env'
+        env_file.write_text('RETRY_TIME = 30\nTELEGRAM_CHAT_ID = 1\n')
+        monkeypatch.setattr(config, 'PROCESS_ENV', {'TELEGRAM_CHAT_ID': '2'})
+        settings = config.load_settings(str(env_file))
+        assert settings.retry_time == 30
+        assert settings.telegram_chat_id == '2', (
+            'Переменные окружения процесса важнее файла .env'
+        )
+        assert settings.homework_statuses == config.DEFAULT_STATUSES
+
+    def test_statuses_file(self, tmp_path, monkeypatch):
+        statuses = tmp_path / 'statuses.json'
+        statuses.write_text(json.dumps({'approved': 'Принято'}))
+        monkeypatch.setattr(
+            config, 'PROCESS_ENV', {'STATUSES_FILE': str(statuses)}
+        )
+        settings = config.load_settings(str(tmp_path / 'missing.env'))
+        assert settings.homework_statuses == {'approved': 'Принято'}
+
+    def test_bad_config_does_not_break_import(self, tmp_path):
+        code = (
+            'import homework\n'
+            'try:\n'
+            '    homework.load_config()\n'
+            'except FileNotFoundError:\n'
+            '    pass\n'
+            'else:\n'
+            '    raise AssertionError("load_config() должна упасть")\n'
+        )
+        env = dict(os.environ, STATUSES_FILE=str(tmp_path / 'missing.json'))
+        result = subprocess.run(
+            [sys.executable, '-c', code], env=env,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 0, (
+            'Ошибка в STATUSES_FILE должна проявляться при запуске бота, '
+            f'а не при импорте: {result.stderr}'
+        )
+
+
+class TestConfigWatcher:
+
+    def test_mtime_change_is_detected_once(self, tmp_path):
+        path = tmp_path / '.env'
+        path.write_text('RETRY_TIME = 60\n')
+        watcher = config.ConfigWatcher(str(path), None)
+        assert watcher.changed() == []
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert watcher.changed() == [str(path)]
+        assert watcher.changed() == []
+
+    def test_sighup_requests_reload(self, tmp_path):
+        path = str(tmp_path / '.env')
+        watcher = config.ConfigWatcher(path)
+        previous = signal.getsignal(signal.SIGHUP)
+        watcher.install_signal_handler()
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+        assert watcher.changed() == [path]
+        assert watcher.changed() == []
+
+
+class TestReload:
+
+    def test_reload_applies_at_cycle_boundary(self, tmp_path, monkeypatch):
+        import homework
+        from scheduler import PollScheduler
+
+        env_file = tmp_path / '.env'
+        env_file.write_text('RETRY_TIME = 5\nPRACTICUM_TOKEN = new\n')
+        monkeypatch.setattr(homework, 'ENV_FILE', str(env_file))
+        monkeypatch.setattr(config, 'PROCESS_ENV', {})
+        old_settings = homework.settings
+        scheduler = PollScheduler()
+        client = homework.create_api_client()
+        try:
+            new_client = homework.reload_config(
+                [str(env_file)], None, client, scheduler
+            )
+            assert homework.RETRY_TIME == 5
+            assert scheduler.base_interval == 5
+            assert homework.HEADERS == {'Authorization': 'OAuth new'}
+            assert new_client is client, (
+                'Клиент API пересоздаётся только при смене его настроек'
+            )
+        finally:
+            homework.apply_settings(old_settings)
+            homework.api_client.use_client(None)
+            client.close()
+
+    def test_log_settings_from_env_file_reload_logging(self, tmp_path,
+                                                       monkeypatch):
+        import homework
+        from scheduler import PollScheduler
+
+        env_file = tmp_path / '.env'
+        env_file.write_text('LOG_SAMPLE_RATE = 5\n')
+        monkeypatch.setattr(homework, 'ENV_FILE', str(env_file))
+        monkeypatch.setattr(config, 'PROCESS_ENV', {})
+        reloads = []
+        monkeypatch.setattr(
+            homework, 'setup_logging',
+            lambda reload=False: reloads.append(homework.settings),
+        )
+        old_settings = homework.settings
+        client = homework.create_api_client()
+        try:
+            for _ in range(2):
+                client = homework.reload_config(
+                    [str(env_file)], None, client, PollScheduler()
+                )
+        finally:
+            homework.apply_settings(old_settings)
+            homework.api_client.use_client(None)
+            client.close()
+        assert [s.log_sample_rate for s in reloads] == [5], (
+            'Смена LOG_* в .env должна перенастраивать логирование, '
+            'и только когда они изменились'
+        )
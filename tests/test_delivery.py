@@ -0,0 +1,165 @@
+import threading
+
+from telegram.error import BadRequest, NetworkError, RetryAfter
+
+import delivery
+import homework
+import metrics
+from clocks import VirtualClock
+from utils import MockBot
+
+
+class TestTokenBucket:
+
+    def test_bucket_refills_with_time(self):
+        clock = VirtualClock()
+        bucket = delivery.TokenBucket(
+            rate=1, capacity=2, clock=clock.monotonic
+        )
+        assert bucket.take() == 0
+        assert bucket.take() == 0
+        assert bucket.take() == 1
+        clock.advance(1)
+        assert bucket.take() == 0
+
+
+class TestMessageQueue:
+
+    def test_messages_are_batched_per_chat(self):
+        bot = MockBot()
+        sender = delivery.MessageQueue(bot, global_rate=1000, chat_rate=1000)
+        sender.send_message(1, 'first')
+        sender.send_message(1, 'second')
+        sender.send_message(2, 'other')
+        sender.start()
+        sender.stop(timeout=5)
+
+        assert sorted(bot.sent) == [(1, 'first\n\nsecond'), (2, 'other')], (
+            'Проверьте, что подряд идущие сообщения в один чат склеиваются'
+        )
+        stats = sender.stats()
+        assert stats['sent'] == 2
+        assert stats['depth'] == 0
+
+    def test_retry_after_is_honored(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(delivery.time, 'sleep', sleeps.append)
+        bot = MockBot(RetryAfter(3))
+        sender = delivery.MessageQueue(bot, chat_rate=1000).start()
+        sender.send_message(1, 'text')
+        sender.stop(timeout=5)
+
+        assert 3 in sleeps, 'Проверьте, что учитывается retry_after'
+        assert bot.sent == [(1, 'text')]
+
+    def test_transient_error_is_retried(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(delivery.time, 'sleep', sleeps.append)
+        bot = MockBot(NetworkError('Connection reset'))
+        sender = delivery.MessageQueue(bot, chat_rate=1000).start()
+        sender.send_message(1, 'text')
+        sender.stop(timeout=5)
+
+        assert bot.sent == [(1, 'text')], (
+            'Проверьте, что сетевая ошибка Телеграма повторяется'
+        )
+        assert delivery.RETRY_DELAY in sleeps
+        assert sender.stats()['destinations'][1]['retries'] == 1
+
+    def test_bad_request_is_not_retried(self, monkeypatch):
+        monkeypatch.setattr(delivery.time, 'sleep', lambda delay: None)
+        bot = MockBot(BadRequest('Chat not found'))
+        sender = delivery.MessageQueue(bot, chat_rate=1000).start()
+        sender.send_message(1, 'text')
+        sender.stop(timeout=5)
+
+        assert bot.sent == []
+        stats = sender.stats()['destinations'][1]
+        assert (stats['failed'], stats['retries']) == (1, 0)
+
+    def test_full_queue_drops_message(self):
+        sender = delivery.MessageQueue(MockBot(), maxsize=1)
+        sender.send_message(1, 'kept')
+        sender.send_message(1, 'lost')
+        assert sender.stats()['dropped'] == 1
+
+
+class SlowChatBot(MockBot):
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if chat_id == 'slow':
+            self.release.wait(5)
+        super().send_message(chat_id, text)
+
+
+class TestFanOut:
+
+    def test_slow_chat_does_not_block_others(self):
+        bot = SlowChatBot()
+        sender = delivery.MessageQueue(
+            bot, global_rate=1000, chat_rate=1000
+        ).start()
+        sender.send_message('slow', 'status')
+        sender.send_message('fast', 'status')
+        sender.send_message('audit', 'status')
+        for _ in range(100):
+            if len(bot.sent) == 2:
+                break
+            threading.Event().wait(0.01)
+        assert sorted(bot.sent) == [('audit', 'status'), ('fast', 'status')], (
+            'Проверьте, что медленный чат не задерживает остальные'
+        )
+        bot.release.set()
+        assert sender.stop(timeout=5)
+
+        stats = sender.stats()
+        assert stats['sent'] == 3
+        assert set(stats['destinations']) == {'slow', 'fast', 'audit'}
+        assert stats['destinations']['fast']['latency_p95'] is not None
+        assert 'chat="fast"' in metrics.render()
+
+    def test_lane_queue_is_bounded(self):
+        bot = SlowChatBot()
+        sender = delivery.MessageQueue(
+            bot, global_rate=1000, chat_rate=1000, lane_size=1
+        )
+        # Длинные тексты не склеиваются в одно сообщение.
+        text = 'x' * (delivery.MESSAGE_LIMIT // 2 + 1)
+        for _ in range(4):
+            sender.send_message('slow', text)
+        sender.start()
+        for _ in range(100):
+            if sender.stats()['dropped'] >= 2:
+                break
+            threading.Event().wait(0.01)
+        stats = sender.stats()
+        assert stats['dropped'] >= 2, (
+            'Очередь недоступного чата не должна расти без предела'
+        )
+        assert stats['destinations']['slow']['dropped'] == stats['dropped']
+        bot.release.set()
+        assert sender.stop(timeout=5)
+        assert len(bot.sent) + sender.stats()['dropped'] == 4
+
+    def test_send_message_fans_out(self, monkeypatch):
+        bot = MockBot()
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_IDS', ('1', '@audit'))
+        homework.send_message(bot, 'text')
+        assert bot.sent == [('1', 'text'), ('@audit', 'text')]
+
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_IDS', ())
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', '7')
+        homework.send_message(bot, 'text')
+        assert bot.sent[-1] == ('7', 'text')
+
+    def test_bot_pool_fits_all_lanes(self, monkeypatch):
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '123:abc')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_IDS', ('1', '2', '3'))
+        bot = homework.create_bot()
+        assert bot.request.con_pool_size == 3, (
+            'Пул соединений бота должен вмещать все параллельные чаты'
+        )
@@ -0,0 +1,41 @@
+from requests import HTTPError
+
+from clocks import VirtualClock
+from error_notifier import ErrorNotifier, RECOVERED_MESSAGE
+
+
+class TestErrorNotifier:
+
+    def test_repeats_are_folded_into_digest(self):
+        clock = VirtualClock()
+        notifier = ErrorNotifier(suppress_time=600, clock=clock.monotonic)
+        error = HTTPError('500')
+
+        assert notifier.report(error, 'API недоступна 500') is not None
+        for _ in range(9):
+            clock.advance(60)
+            assert notifier.report(error, 'API недоступна 500') is None, (
+                'Повторы ошибки внутри окна должны подавляться'
+            )
+        clock.advance(60)
+        digest = notifier.report(error, 'API недоступна 500')
+        assert 'Повторилось 9 раз за последние 10 мин.' in digest
+
+    def test_numbers_do_not_split_errors(self):
+        notifier = ErrorNotifier()
+        error = KeyError('x')
+        assert notifier.report(error, 'timeout 1000198000') is not None
+        assert notifier.report(error, 'timeout 1000198060') is None
+
+    def test_recovered_is_sent_once(self):
+        notifier = ErrorNotifier()
+        assert notifier.recovered() is None
+        notifier.report(TypeError(), 'Неожиданный формат данных')
+        assert notifier.recovered() == RECOVERED_MESSAGE
+        assert notifier.recovered() is None
+
+    def test_cache_is_bounded(self):
+        notifier = ErrorNotifier(max_errors=2)
+        for name in 'abc':
+            notifier.report(Exception(), name)
+        assert len(notifier.errors) == 2
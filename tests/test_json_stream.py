@@ -0,0 +1,95 @@
+import json
+import tracemalloc
+
+import pytest
+
+from json_stream import ObjectStream
+from validator import ResponseValidator
+
+
+def byte_chunks(document, size=1):
+    data = json.dumps(document, ensure_ascii=False).encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestObjectStream:
+
+    def test_items_and_fields_from_tiny_chunks(self):
+        document = {
+            'homeworks': [
+                {'id': 12345, 'homework_name': 'работа', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'reviewing'},
+            ],
+            'current_date': 1650000000,
+        }
+        stream = ObjectStream(byte_chunks(document), 'homeworks')
+        assert list(stream) == document['homeworks']
+        assert stream.get('current_date') == 1650000000, (
+            'Числа на границе кусков не должны обрезаться'
+        )
+        assert stream.envelope() == {
+            'homeworks': [], 'current_date': 1650000000,
+        }
+
+    @pytest.mark.parametrize('size', [1, 2, 3])
+    def test_fraction_and_exponent_split_across_chunks(self, size):
+        data = (
+            b'{"homeworks": [{"id": 1, "score": 1.5e3}], '
+            b'"current_date": 12.25, "ratio": -2.5E-2}'
+        )
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+        stream = ObjectStream(chunks, 'homeworks')
+        assert list(stream) == [{'id': 1, 'score': 1500.0}]
+        assert stream.envelope() == {
+            'homeworks': [], 'current_date': 12.25, 'ratio': -0.025,
+        }, 'Кусок, оборванный на «12.» или «1e», не должен ломать разбор'
+
+    def test_connection_is_closed_after_reading(self):
+        closed = []
+        stream = ObjectStream(
+            [b'{"homeworks": []}'], 'homeworks',
+            close=lambda: closed.append(True),
+        )
+        assert list(stream) == []
+        assert closed == [True]
+        with pytest.raises(RuntimeError):
+            list(stream)
+
+    @pytest.mark.parametrize('body', [
+        b'{"homeworks": [{"id": 1}',
+        b'{"homeworks": [{"id": 1} {"id": 2}]}',
+    ])
+    def test_broken_body(self, body):
+        with pytest.raises(ValueError):
+            list(ObjectStream([body], 'homeworks'))
+
+    @pytest.mark.parametrize('body, exception', [
+        (b'[1, 2]', TypeError),
+        (b'{"current_date": 1}', KeyError),
+        (b'{"homeworks": "hw"}', TypeError),
+    ])
+    def test_envelope_is_validated_after_stream(self, body, exception):
+        stream = ObjectStream([body], 'homeworks')
+        records, [error] = ResponseValidator({}).validate(stream)
+        assert records == []
+        assert isinstance(error.exception(), exception)
+
+    def test_memory_does_not_grow_with_response(self):
+        item = json.dumps(
+            {'id': 1, 'homework_name': 'hw' * 50, 'status': 'approved'}
+        ).encode()
+
+        def body(count):
+            yield b'{"homeworks": ['
+            for index in range(count):
+                yield (b', ' if index else b'') + item
+            yield b'], "current_date": 1}'
+
+        tracemalloc.start()
+        try:
+            for _ in ObjectStream(body(20000), 'homeworks'):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < len(item) * 20000 / 10
@@ -0,0 +1,72 @@
+import lease
+from shutdown import Shutdown
+
+
+class TestLeaseBackends:
+
+    def test_sqlite_lease_is_exclusive_until_expiry(self, tmp_path,
+                                                    monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(lease.time, 'time', lambda: now[0])
+        backend = lease.SQLiteLease(str(tmp_path / 'lease.db'))
+        assert backend.acquire('a', ttl=30)
+        assert not backend.acquire('b', ttl=30), (
+            'Пока аренда не истекла, второй процесс её не получает'
+        )
+        assert backend.acquire('a', ttl=30)
+        now[0] += 31
+        assert backend.acquire('b', ttl=30)
+        backend.release('b')
+        assert backend.acquire('a', ttl=30)
+
+    def test_file_lease_is_exclusive(self, tmp_path):
+        path = str(tmp_path / 'lease.lock')
+        first = lease.FileLease(path)
+        second = lease.FileLease(path)
+        assert first.acquire('a', ttl=30)
+        assert not second.acquire('b', ttl=30)
+        first.release('a')
+        assert second.acquire('b', ttl=30)
+        second.release('b')
+
+    def test_create_backend(self, tmp_path):
+        assert isinstance(lease.create_backend('none'), lease.NullLease)
+        backend = lease.create_backend(f'sqlite:{tmp_path}/lease.db')
+        assert isinstance(backend, lease.SQLiteLease)
+
+
+class TestLeaderElector:
+
+    def test_standby_waits_and_stops_on_shutdown(self, tmp_path):
+        path = str(tmp_path / 'lease.db')
+        leader = lease.LeaderElector(lease.SQLiteLease(path), owner='a')
+        standby = lease.LeaderElector(
+            lease.SQLiteLease(path), ttl=0.3, owner='b'
+        )
+        shutdown = Shutdown()
+        assert leader.wait_for_leadership(shutdown)
+        assert leader.is_leader
+
+        shutdown.request()
+        assert not standby.wait_for_leadership(shutdown)
+        leader.release()
+        assert not leader.is_leader
+        assert standby.wait_for_leadership(Shutdown()), (
+            'После освобождения аренды резерв должен её получить'
+        )
+        standby.release()
+
+    def test_lost_lease_calls_back(self, tmp_path):
+        class StolenLease(lease.NullLease):
+            def acquire(self, owner, ttl):
+                self.calls = getattr(self, 'calls', 0) + 1
+                return self.calls == 1
+
+        shutdown = Shutdown()
+        elector = lease.LeaderElector(
+            StolenLease(), ttl=0.03, on_lost=shutdown.request
+        )
+        assert elector.wait_for_leadership(shutdown)
+        assert shutdown.wait(2), 'Потеря аренды должна останавливать опрос'
+        assert not elector.is_leader
+        elector.release()
@@ -0,0 +1,90 @@
+import json
+import logging
+
+import log_setup
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_logger(name):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = ListHandler()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+class TestLogSetup:
+
+    def test_sampling_keeps_warnings(self):
+        logger, handler = make_logger('test_sampling')
+        logger.addFilter(log_setup.SamplingFilter(10))
+        for _ in range(100):
+            logger.info('Произошел запрос к API')
+        for _ in range(3):
+            logger.error('API недоступна')
+        messages = [record.getMessage() for record in handler.records]
+        assert messages.count('Произошел запрос к API') == 10, (
+            'Проверьте, что проходит каждая десятая запись INFO'
+        )
+        assert messages.count('API недоступна') == 3
+
+    def test_json_formatter(self):
+        record = logging.LogRecord(
+            'homework', logging.INFO, __file__, 1, 'hw %s', ('ok',), None
+        )
+        entry = json.loads(log_setup.JsonFormatter().format(record))
+        assert entry['message'] == 'hw ok'
+        assert entry['level'] == 'INFO'
+        assert entry['logger'] == 'homework'
+
+    def test_queue_logging_moves_handlers(self):
+        logger, handler = make_logger('test_queue')
+        listener = log_setup.start_queue_logging(logger)
+        logger.info('через очередь')
+        log_setup.stop_listener(listener)
+        assert isinstance(logger.handlers[0], log_setup.QueueHandler)
+        assert [r.getMessage() for r in handler.records] == ['через очередь']
+
+    def test_reconfigure_replaces_sampler(self):
+        names = ('test_resample',)
+        logger = logging.getLogger(names[0])
+        log_setup.add_sampling(10, names)
+        sampler = log_setup.add_sampling(5, names)
+        assert logger.filters == [sampler], (
+            'Повторная настройка не должна копить фильтры выборки'
+        )
+        log_setup.remove_sampling(names)
+        assert logger.filters == []
+
+    def test_stopped_listener_is_forgotten(self):
+        logger, handler = make_logger('test_forget')
+        first = log_setup.start_queue_logging(logger)
+        log_setup.stop_listener(first)
+        second = log_setup.start_queue_logging(logger)
+        assert first not in log_setup._listeners
+        assert second in log_setup._listeners
+        log_setup.stop_listeners()
+        assert not log_setup._listeners
+
+    def test_configure_takes_values_from_caller(self):
+        sampler = None
+        try:
+            assert log_setup.configure(sample_rate=5) is None
+            filters = logging.getLogger('homework').filters
+            sampler = next(
+                f for f in filters if isinstance(f, log_setup.SamplingFilter)
+            )
+            assert sampler.rate == 5
+        finally:
+            log_setup.configure()
+        assert sampler not in logging.getLogger('homework').filters
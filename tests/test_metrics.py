@@ -0,0 +1,63 @@
+import requests
+
+import homework  # noqa: F401
+import metrics
+from metrics import Histogram
+
+
+class TestHistogram:
+
+    def test_percentile_uses_bucket_bounds(self):
+        histogram = Histogram(buckets=(0.1, 1, float('inf')))
+        for _ in range(95):
+            histogram.observe(0.05)
+        for _ in range(5):
+            histogram.observe(0.5)
+        assert histogram.percentile(0.95) == 0.1
+        assert histogram.percentile(0.99) == 1
+        assert histogram.count == 100
+
+    def test_empty_histogram(self):
+        assert Histogram().percentile(0.5) is None
+
+
+class TestExporter:
+
+    def test_render_prometheus_format(self):
+        errors = metrics.Counter('test_errors_total', 'Ошибки')
+        errors.inc(error='HTTPError')
+        errors.inc(error='HTTPError')
+        latency = metrics.Histogram(
+            'test_latency_seconds', 'Задержка', buckets=(0.1, float('inf'))
+        )
+        latency.observe(0.05)
+        latency.observe(1)
+        lag = metrics.Gauge('test_lag_seconds', 'Отставание')
+        lag.set_function(lambda: 1.5)
+        try:
+            text = metrics.render()
+        finally:
+            for metric in (errors, latency, lag):
+                metrics.REGISTRY.remove(metric)
+
+        assert '# TYPE test_errors_total counter' in text
+        assert 'test_errors_total{error="HTTPError"} 2.0' in text
+        assert 'test_latency_seconds_bucket{le="0.1"} 1.0' in text
+        assert 'test_latency_seconds_bucket{le="+Inf"} 2.0' in text
+        assert 'test_latency_seconds_count 2.0' in text
+        assert 'test_lag_seconds 1.5' in text
+
+    def test_metrics_endpoint(self):
+        server = metrics.start_http_server(0)
+        host, port = server.server_address
+        try:
+            response = requests.get(f'http://{host}:{port}/metrics')
+            missing = requests.get(f'http://{host}:{port}/other')
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert response.status_code == 200
+        assert 'homework_api_request_seconds_count' in response.text, (
+            'Проверьте, что метрики бота регистрируются при импорте'
+        )
+        assert missing.status_code == 404
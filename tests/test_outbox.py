@@ -0,0 +1,145 @@
+from telegram.error import BadRequest
+
+import delivery
+import homework
+import outbox
+from outbox import Outbox
+from tracker import StatusTracker
+from utils import MockBot
+from validator import Homework
+
+
+class TestOutbox:
+
+    def test_pending_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'outbox.jsonl')
+        journal = Outbox(path)
+        first = journal.add(1, 'first')
+        journal.add(1, 'second')
+        journal.mark_done([first])
+        journal.close()
+
+        restarted = Outbox(path)
+        assert [e['text'] for e in restarted.pending()] == ['second'], (
+            'Проверьте, что после перезапуска остаются только неотправленные'
+        )
+        assert restarted.add(1, 'first', key=first) is None, (
+            'Отправленный ключ не должен записываться повторно'
+        )
+        restarted.close()
+
+    def test_compaction_keeps_pending(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(outbox, 'COMPACT_AFTER', 10)
+        monkeypatch.setattr(outbox, 'DONE_KEYS', 5)
+        path = tmp_path / 'outbox.jsonl'
+        journal = Outbox(str(path))
+        keep = journal.add(1, 'keep')
+        for index in range(20):
+            journal.mark_done([journal.add(1, str(index))])
+        journal.close()
+        assert len(path.read_text().splitlines()) < 20, (
+            'Проверьте, что журнал сжимается'
+        )
+        assert [e['key'] for e in Outbox(str(path)).pending()] == [keep]
+
+
+class TestQueueWithOutbox:
+
+    def test_failed_send_is_replayed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(delivery.time, 'sleep', lambda delay: None)
+        journal = Outbox(str(tmp_path / 'outbox.jsonl'))
+        bot = MockBot(
+            *[ConnectionError('Telegram недоступен')] * delivery.MAX_ATTEMPTS
+        )
+        sender = delivery.MessageQueue(bot, chat_rate=1000, outbox=journal)
+        sender.thread.start()
+        sender.send_message(1, 'status')
+        sender.stop(timeout=5)
+        assert bot.sent == []
+        assert len(journal.pending()) == 1
+
+        sender = delivery.MessageQueue(bot, chat_rate=1000, outbox=journal)
+        sender.thread.start()
+        sender.replay()
+        sender.replay()
+        sender.stop(timeout=5)
+        assert bot.sent == [(1, 'status')], (
+            'Проверьте, что неотправленное досылается ровно один раз'
+        )
+        assert journal.pending() == []
+        journal.close()
+
+    def test_same_status_change_is_sent_once(self, tmp_path):
+        journal = Outbox(str(tmp_path / 'outbox.jsonl'))
+        bot = MockBot()
+        record = Homework(7, 'hw7', 'approved', 'Ура!', 1000198000)
+        for _ in range(2):
+            # Падение до записи checkpoint: tracker снова пустой.
+            sender = delivery.MessageQueue(
+                bot, chat_rate=1000, outbox=journal
+            ).start()
+            homework.notify_changes(sender, StatusTracker(), [record])
+            sender.stop(timeout=5)
+        assert len(bot.sent) == len(homework.recipients()), (
+            'Одна смена статуса должна доставляться один раз'
+        )
+        journal.close()
+
+    def test_resubmission_is_not_deduplicated(self, tmp_path):
+        journal = Outbox(str(tmp_path / 'outbox.jsonl'))
+        bot = MockBot()
+        tracker = StatusTracker()
+        sender = delivery.MessageQueue(
+            bot, chat_rate=1000, outbox=journal
+        ).start()
+        transitions = ['reviewing', 'rejected', 'reviewing', 'approved']
+        for updated, status in enumerate(transitions, start=1000198000):
+            record = Homework(7, 'hw7', status, status, updated)
+            homework.notify_changes(sender, tracker, [record])
+        sender.stop(timeout=5)
+        texts = [
+            text for _, batch in bot.sent for text in batch.split('\n\n')
+        ]
+        assert len(texts) == len(transitions) * len(homework.recipients()), (
+            'Повторная отправка на проверку после rejected не должна '
+            'отсеиваться журналом'
+        )
+        journal.close()
+
+    def test_rejected_message_is_not_replayed(self, tmp_path):
+        path = str(tmp_path / 'outbox.jsonl')
+        journal = Outbox(path)
+        bot = MockBot(BadRequest('Chat not found'))
+        sender = delivery.MessageQueue(bot, chat_rate=1000, outbox=journal)
+        sender.thread.start()
+        sender.send_message(1, 'status')
+        sender.stop(timeout=5)
+        assert journal.pending() == [], (
+            'Отвергнутое Телеграмом не должно повторяться из журнала'
+        )
+        journal.close()
+
+        restarted = Outbox(path)
+        assert restarted.pending() == []
+        assert '"op": "rejected"' in open(path, encoding='utf-8').read()
+        restarted.close()
+
+    def test_stale_replay_skips_delivered(self, tmp_path, monkeypatch):
+        journal = Outbox(str(tmp_path / 'outbox.jsonl'))
+        bot = MockBot()
+        sender = delivery.MessageQueue(bot, chat_rate=1000, outbox=journal)
+        sender.thread.start()
+        sender.send_message(1, 'status', key='1:7:approved')
+        stale = journal.pending()
+        sender.stop(timeout=5)
+        assert journal.is_done('1:7:approved')
+
+        monkeypatch.setattr(journal, 'pending', lambda: stale)
+        sender = delivery.MessageQueue(bot, chat_rate=1000, outbox=journal)
+        sender.thread.start()
+        sender.replay()
+        sender.stop(timeout=5)
+        assert bot.sent == [(1, 'status')], (
+            'Повтор по устаревшему снимку журнала не должен дублировать'
+        )
+        journal.close()
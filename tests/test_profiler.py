@@ -0,0 +1,40 @@
+import json
+import os
+import time
+
+from profiler import Profiler
+
+
+class TestProfiler:
+
+    def test_idle_profiler_does_nothing(self, tmp_path):
+        profiler = Profiler(str(tmp_path / 'profiles'))
+        with profiler.cycle():
+            with profiler.stage('fetch'):
+                pass
+        assert not profiler.active
+        assert not os.path.exists(tmp_path / 'profiles')
+
+    def test_requested_cycles_are_captured(self, tmp_path):
+        directory = tmp_path / 'profiles'
+        profiler = Profiler(str(directory))
+        profiler.request(cycles=2)
+        for _ in range(2):
+            with profiler.cycle():
+                assert profiler.active
+                with profiler.stage('fetch'):
+                    time.sleep(0.01)
+                    with profiler.stage('parse'):
+                        time.sleep(0.02)
+        assert not profiler.active, 'Захват должен закончиться через 2 цикла'
+
+        files = sorted(os.listdir(directory))
+        assert [name.split('.', 1)[1] for name in files] == [
+            'pstats', 'stages.json', 'tracemalloc',
+        ]
+        stages_file = next(name for name in files if name.endswith('.json'))
+        stages = json.loads((directory / stages_file).read_text())
+        assert stages['fetch']['count'] == stages['parse']['count'] == 2
+        assert stages['fetch']['total_ms'] < stages['parse']['total_ms'], (
+            'Время вложенного этапа не должно входить во внешний'
+        )
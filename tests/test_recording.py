@@ -0,0 +1,61 @@
+import types
+
+import pytest
+
+import homework
+from recording import Recorder, load_events
+from tracker import StatusTracker
+from utils import MockBot
+from validator import Homework
+
+
+class TestRecorder:
+
+    def test_calls_are_recorded_without_tokens(self, tmp_path):
+        def get_api_answer(current_timestamp):
+            if current_timestamp is None:
+                raise ValueError('token secret-practicum rejected')
+            return {'homeworks': [], 'current_date': current_timestamp}
+
+        module = types.SimpleNamespace(
+            get_api_answer=get_api_answer,
+            stream_api_answer=None,
+            send_message_to=lambda bot, chat_id, message, key=None: None,
+        )
+        path = str(tmp_path / 'session.jsonl')
+        recorder = Recorder(path, secrets=('secret-practicum', None))
+        recorder.install(module)
+        assert module.stream_api_answer is module.get_api_answer, (
+            'Потоковый запрос при записи должен заменяться обычным'
+        )
+        module.get_api_answer(5)
+        with pytest.raises(ValueError):
+            module.get_api_answer(None)
+        module.send_message_to(None, 42, 'hi secret-practicum')
+        recorder.close()
+
+        assert module.get_api_answer is get_api_answer
+        api, error, telegram = load_events(path)
+        assert api['response'] == {'homeworks': [], 'current_date': 5}
+        assert error['error'] == 'ValueError'
+        assert error['message'] == 'token *** rejected'
+        assert telegram['text'] == 'hi ***'
+        assert 'secret-practicum' not in open(path, encoding='utf-8').read()
+
+    def test_status_notifications_are_recorded(self, tmp_path):
+        path = str(tmp_path / 'session.jsonl')
+        bot = MockBot()
+        record = Homework(7, 'hw7', 'approved', 'Ура!', 1000198000)
+        recorder = Recorder(path).install(homework)
+        try:
+            changed = homework.notify_changes(bot, StatusTracker(), [record])
+        finally:
+            recorder.close()
+
+        assert changed == 1
+        assert bot.texts == [homework.format_status(record)], (
+            'Запись сессии не должна мешать отправке уведомлений'
+        )
+        events = load_events(path)
+        assert [event['text'] for event in events] == bot.texts
+        assert events[0]['key'].endswith(record.transition)
@@ -0,0 +1,43 @@
+from requests import HTTPError
+
+import scheduler
+from clocks import VirtualClock
+
+
+class TestPollScheduler:
+
+    def test_reviewing_polls_faster(self):
+        poller = scheduler.PollScheduler(clock=VirtualClock().monotonic)
+        poller.record_success(changed=True, reviewing=True)
+        assert poller.interval() == scheduler.REVIEWING_INTERVAL
+
+    def test_idle_polls_slower(self):
+        clock = VirtualClock()
+        poller = scheduler.PollScheduler(clock=clock.monotonic)
+        poller.record_success(changed=False, reviewing=False)
+        assert poller.interval() == scheduler.BASE_INTERVAL
+        clock.advance(scheduler.IDLE_AFTER)
+        assert poller.interval() == scheduler.IDLE_INTERVAL, (
+            'Проверьте, что без изменений опрос замедляется'
+        )
+
+    def test_backoff_after_http_error(self):
+        poller = scheduler.PollScheduler(clock=VirtualClock().monotonic)
+        poller.record_failure(HTTPError('500'))
+        poller.record_failure(HTTPError('500'))
+        assert poller.interval() == scheduler.BASE_INTERVAL * 4
+        for _ in range(10):
+            poller.record_failure(HTTPError('500'))
+        assert poller.interval() == scheduler.MAX_BACKOFF
+        delay = poller.next_delay()
+        assert scheduler.BASE_INTERVAL <= delay <= scheduler.MAX_BACKOFF
+
+        poller.record_failure(KeyError('homeworks'))
+        poller.record_success(changed=False, reviewing=False)
+        assert poller.interval() == scheduler.BASE_INTERVAL
+
+    def test_jitter_is_bounded(self):
+        poller = scheduler.PollScheduler(clock=VirtualClock().monotonic)
+        for _ in range(100):
+            delay = poller.next_delay()
+            assert 54 <= delay <= 66
@@ -0,0 +1,77 @@
+import signal
+import time
+
+import requests
+import telegram
+
+import homework
+from clocks import VirtualClock
+from shutdown import Shutdown
+from utils import MockBot
+
+
+class MockResponse:
+    status_code = 200
+
+    def json(self):
+        return {
+            'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+            'current_date': 1000198000,
+        }
+
+
+class TestShutdown:
+
+    def test_wait_is_interrupted(self):
+        shutdown = Shutdown()
+        shutdown.request()
+        started = time.monotonic()
+        assert shutdown.wait(60)
+        assert time.monotonic() - started < 1
+
+    def test_wait_on_virtual_clock_does_not_block(self):
+        clock = VirtualClock(start=1000)
+        shutdown = Shutdown(clock=clock)
+        started = time.monotonic()
+        assert not shutdown.wait(3600)
+        assert time.monotonic() - started < 1
+        assert (clock.time(), clock.monotonic()) == (4600, 3600)
+
+    def test_main_drains_and_flushes_on_shutdown(self, tmp_path,
+                                                 monkeypatch):
+        checkpoint = tmp_path / 'checkpoint.json'
+        monkeypatch.setattr(homework, 'CHECKPOINT_FILE', str(checkpoint))
+        monkeypatch.setattr(
+            homework, 'OUTBOX_FILE', str(tmp_path / 'outbox.jsonl')
+        )
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'token')
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '123:abc')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 1)
+        monkeypatch.setattr(homework, 'HEADERS', {'Authorization': 'OAuth t'})
+        monkeypatch.setattr(homework, 'load_config', lambda: None)
+        monkeypatch.setattr(homework, 'setup_logging', lambda: None)
+        bot = MockBot()
+        monkeypatch.setattr(telegram, 'Bot', lambda token, **kwargs: bot)
+        monkeypatch.setattr(
+            requests.Session, 'get', lambda *args, **kwargs: MockResponse()
+        )
+        monkeypatch.setattr(
+            homework, 'sleep_until_next_cycle',
+            lambda delay, shutdown: shutdown.request(),
+        )
+        handlers = {
+            signum: signal.getsignal(signum)
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP,
+                           signal.SIGUSR1)
+        }
+        try:
+            homework.main()
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+            homework.api_client.use_client(None)
+
+        assert bot.texts == [
+            homework.parse_status({'homework_name': 'hw', 'status': 'approved'})
+        ], 'Проверьте, что очередь сообщений досылается при остановке'
+        assert '1000198000' in checkpoint.read_text()
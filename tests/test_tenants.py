@@ -0,0 +1,53 @@
+import json
+import sqlite3
+
+import tenants
+from utils import MockBot
+
+
+class TestTenants:
+
+    def test_load_tenants_json(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([
+            {'practicum_token': 'a', 'telegram_chat_id': 1},
+            {'name': 'bob', 'practicum_token': 'b', 'telegram_chat_id': 2},
+        ]))
+        loaded = tenants.load_tenants(str(path))
+        assert [t.chat_id for t in loaded] == [1, 2]
+        assert loaded[1].headers == {'Authorization': 'OAuth b'}
+
+    def test_load_tenants_sqlite(self, tmp_path):
+        path = str(tmp_path / 'tenants.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                'CREATE TABLE tenants '
+                '(name TEXT, practicum_token TEXT, telegram_chat_id TEXT)'
+            )
+            connection.execute(
+                "INSERT INTO tenants VALUES ('alice', 'a', '100')"
+            )
+        loaded = tenants.load_tenants(path)
+        assert len(loaded) == 1
+        assert loaded[0].practicum_token == 'a'
+
+    def test_timestamps_are_per_tenant(self, monkeypatch):
+        answers = {'OAuth a': 111, 'OAuth b': 222}
+
+        def mock_fetch(current_timestamp, headers):
+            return {
+                'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+                'current_date': answers[headers['Authorization']],
+            }
+
+        monkeypatch.setattr(tenants.homework, 'fetch_api_answer', mock_fetch)
+        bot = MockBot()
+        registry = [tenants.Tenant('a', 'a', 1), tenants.Tenant('b', 'b', 2)]
+        scheduler = tenants.TenantScheduler(bot, registry, max_workers=2)
+        scheduler.run_cycle()
+        scheduler.shutdown()
+
+        assert [t.current_timestamp for t in registry] == [111, 222], (
+            'Проверьте, что у каждого пользователя своя метка времени'
+        )
+        assert sorted(chat for chat, _ in bot.sent) == [1, 2]
@@ -0,0 +1,32 @@
+from tracker import StatusTracker
+from validator import Homework
+
+
+class TestStatusTracker:
+
+    def test_only_transitions_are_reported(self):
+        tracker = StatusTracker()
+        homeworks = [
+            Homework(2, 'hw2', 'reviewing', ''),
+            Homework(1, 'hw1', 'approved', ''),
+        ]
+        changes = tracker.changes(homeworks)
+        assert [hw.id for hw in changes] == [1, 2], (
+            'Проверьте, что сообщаются все работы, от старых к новым'
+        )
+        for hw in changes:
+            tracker.remember(hw)
+
+        assert tracker.changes(homeworks) == [], (
+            'Повтор того же статуса не должен давать сообщение'
+        )
+        homeworks[0].status = 'approved'
+        assert tracker.changes(homeworks) == [homeworks[0]]
+
+    def test_statuses_restore_from_checkpoint(self):
+        tracker = StatusTracker({'1': 'approved'})
+        assert tracker.changes([Homework(1, 'hw1', 'approved', '')]) == []
+
+    def test_name_is_key_without_id(self):
+        tracker = StatusTracker({'hw1': 'approved'})
+        assert tracker.changes([Homework(None, 'hw1', 'approved', '')]) == []
@@ -0,0 +1,49 @@
+import pytest
+
+from validator import Homework, ResponseValidator
+
+STATUSES = {'approved': 'Ура!', 'reviewing': 'На проверке.'}
+
+
+class TestResponseValidator:
+
+    def test_valid_response(self):
+        records, errors = ResponseValidator(STATUSES).validate({
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+            ],
+        })
+        assert errors == []
+        [record] = records
+        assert isinstance(record, Homework)
+        assert (record.key, record.name, record.verdict) == (
+            '1', 'hw1', 'Ура!'
+        )
+        with pytest.raises(AttributeError):
+            record.extra = True
+
+    @pytest.mark.parametrize('response, kind, exception', [
+        ([], 'type', TypeError),
+        ({}, 'key', KeyError),
+        ({'homeworks': 'hw'}, 'type', TypeError),
+    ])
+    def test_envelope_errors(self, response, kind, exception):
+        records, [error] = ResponseValidator(STATUSES).validate(response)
+        assert records == []
+        assert error.kind == kind
+        assert isinstance(error.exception(), exception)
+
+    def test_bad_items_do_not_hide_good_ones(self):
+        records, errors = ResponseValidator(STATUSES).validate({
+            'homeworks': [
+                'broken',
+                {'homework_name': 'hw1'},
+                {'homework_name': 'hw2', 'status': 'unknown'},
+                {'homework_name': 'hw3', 'status': 'reviewing'},
+            ],
+        })
+        assert [record.name for record in records] == ['hw3']
+        assert [error.path for error in errors] == [
+            'homeworks[0]', 'homeworks[1].status', 'homeworks[2].status',
+        ]
+        assert [error.kind for error in errors] == ['type', 'key', 'key']
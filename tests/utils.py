@@ -37,3 +37,29 @@ def check_default_var_exists(scope: ModuleType, var_name: str) -> None:
         f'{var_name} должна быть переменной, а не функцией.'
     )
 
+
+class MockBot:
+    """Telegram bot stub that records sent messages as (chat_id, text).
+
+    :param errors: Exceptions raised by the first sends, one per call
+    """
+
+    def __init__(self, *errors):
+        self.sent = []
+        self.errors = list(errors)
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append((chat_id, text))
+
+    @property
+    def texts(self):
+        return [text for _, text in self.sent]
+
+
+class MemoryCheckpoint(dict):
+    """In-memory stand-in for checkpoint.CheckpointStore."""
+
+    def update(self, **values):
+        super().update(values)
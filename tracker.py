@@ -0,0 +1,24 @@
+class StatusTracker:
+    """Последний известный статус каждой домашней работы."""
+
+    def __init__(self, statuses=None):
+        """Принимает сохранённые статусы вида {ключ работы: статус}."""
+        self.statuses = dict(statuses or {})
+
+    def changes(self, homeworks):
+        """Работы (записи validator.Homework) со сменившимся статусом.
+
+        homeworks может быть генератором: в памяти остаются только
+        изменившиеся работы. Порядок — от старых к новым.
+        """
+        statuses = self.statuses
+        changes = [
+            homework for homework in homeworks
+            if statuses.get(homework.key) != homework.status
+        ]
+        changes.reverse()
+        return changes
+
+    def remember(self, homework):
+        """Запоминает статус после успешного уведомления."""
+        self.statuses[homework.key] = homework.status
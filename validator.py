@@ -0,0 +1,142 @@
+from collections import namedtuple
+
+from json_stream import ObjectStream
+
+ITEM_SCHEMA = ("homework_name", "status")
+
+
+class ValidationError(namedtuple("ValidationError", "kind path message")):
+    """Описание ошибки в ответе API вместо брошенного исключения."""
+
+    __slots__ = ()
+
+    def exception(self):
+        """Исключение, которое раньше бросали check_response/parse_status."""
+        if self.kind == "type":
+            return TypeError(self.message)
+        return KeyError(self.message)
+
+
+class Homework:
+    """Проверенная домашняя работа."""
+
+    __slots__ = ("id", "name", "status", "verdict", "updated")
+
+    def __init__(self, id, name, status, verdict, updated=None):
+        """Поля берутся из словаря ответа API; updated — date_updated."""
+        self.id = id
+        self.name = name
+        self.status = status
+        self.verdict = verdict
+        self.updated = updated
+
+    @property
+    def key(self):
+        """Ключ работы: id, а если его нет — название."""
+        return str(self.name if self.id is None else self.id)
+
+    @property
+    def transition(self):
+        """Ключ смены статуса с date_updated; None, если даты нет.
+
+        Работа может вернуться в прежний статус (reviewing → rejected →
+        reviewing), поэтому одного статуса для ключа мало.
+        """
+        if self.updated is None:
+            return None
+        return f"{self.key}:{self.status}:{self.updated}"
+
+    def __repr__(self):
+        """Короткое представление для логов."""
+        return f"Homework({self.key!r}, {self.status!r})"
+
+
+class ResponseValidator:
+    """Проверка ответа API за один проход, без исключений.
+
+    Схема и словарь вердиктов фиксируются при создании; при смене
+    шаблонов статусов создаётся новый валидатор.
+    """
+
+    def __init__(self, statuses, item_schema=ITEM_SCHEMA):
+        """Шаблоны вердиктов — словарь {статус: вердикт}."""
+        self.statuses = dict(statuses)
+        self.item_schema = tuple(item_schema)
+
+    def envelope(self, response):
+        """Список работ из ответа или (None, ошибка)."""
+        if not isinstance(response, dict):
+            return None, ValidationError(
+                "type", "",
+                "Unexpected response in check_response function, "
+                "dict expected",
+            )
+        homeworks = response.get("homeworks")
+        if homeworks is None:
+            return None, ValidationError(
+                "key", "homeworks", "В ответе API отсутствует ключ homeworks"
+            )
+        if not isinstance(homeworks, list):
+            return None, ValidationError(
+                "type", "homeworks",
+                "homeworks dictionary contains non-tuple values",
+            )
+        return homeworks, None
+
+    def item(self, homework, path="homework"):
+        """Запись Homework или (None, ошибка)."""
+        if not isinstance(homework, dict):
+            return None, ValidationError(
+                "type", path,
+                "Unexpected response in parse_status function, dict expected",
+            )
+        for field in self.item_schema:
+            if homework.get(field) is None:
+                return None, ValidationError(
+                    "key", f"{path}.{field}",
+                    f"В ответе API отсутствует ключ {field}",
+                )
+        status = homework["status"]
+        verdict = None
+        if isinstance(status, str):
+            verdict = self.statuses.get(status)
+        if verdict is None:
+            return None, ValidationError(
+                "key", f"{path}.status",
+                f"Недокументированный статус работы {status!r}",
+            )
+        return Homework(
+            homework.get("id"), homework["homework_name"], status, verdict,
+            homework.get("date_updated"),
+        ), None
+
+    def validate(self, response):
+        """Все работы ответа: (записи Homework, список ошибок)."""
+        errors = []
+        return list(self.iter_records(response, errors)), errors
+
+    def iter_records(self, response, errors):
+        """Записи Homework по одной; ошибки дописываются в errors.
+
+        response — словарь ответа или json_stream.ObjectStream; формат
+        потока проверяется после того, как он прочитан целиком.
+        """
+        streamed = isinstance(response, ObjectStream)
+        if streamed:
+            homeworks = response
+        else:
+            homeworks, error = self.envelope(response)
+            if error is not None:
+                errors.append(error)
+                return
+        item = self.item
+        for index, homework in enumerate(homeworks):
+            record, error = item(homework, f"homeworks[{index}]")
+            if error is None:
+                yield record
+            else:
+                errors.append(error)
+        if streamed:
+            _, error = self.envelope(response.envelope())
+            if error is not None:
+                errors.append(error)